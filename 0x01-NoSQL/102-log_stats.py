@@ -11,68 +11,127 @@ Display (same as example):
 """
 
 from pymongo import MongoClient
+import sys
 
 # Define the list of HTTP methods to check
 METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
 
+# Compound index holding every field the stats read, so that
+# they can be computed from the index alone (covered)
+STATS_INDEX_KEYS = [("method", 1), ("path", 1), ("ip", 1)]
+STATS_INDEX = "method_1_path_1_ip_1"
 
-def log_stats(mongo_collection):
+
+def stats_pipeline():
     """
-    Provide some stats about Nginx logs stored in MongoDB
+    Build the aggregation pipeline computing every number of
+    `log_stats` in a single pass over the collection.
 
-    Parameters:
-    mongo_collection (Collection): The pymongo collection object (MongoDB
-    collection) containing the Nginx logs from which to retrieve stats.
+    Returns:
+    list: The aggregation pipeline, returning one document with
+    the "total", "methods", "status" and "ips" results.
+    """
+    return [
+        # Only keep the indexed fields, so that the pass can read
+        # the STATS_INDEX index instead of the documents
+        {"$project": {"_id": 0, "method": 1, "path": 1, "ip": 1}},
+        # Each $facet sub-pipeline works on that same
+        # stream of documents
+        {"$facet": {
+            # Count the total number of documents
+            "total": [{"$count": "count"}],
+            # Count the number of documents per HTTP method
+            "methods": [{"$group": {"_id": "$method", "count": {"$sum": 1}}}],
+            # Count the documents where method is "GET"
+            # and path is "/status"
+            "status": [{"$match": {"method": "GET", "path": "/status"}},
+                       {"$count": "count"}],
+            # Group by IP, count occurrences, sort by count in
+            # descending order (then by IP, to order ties the
+            # same way every time) and keep the top 10
+            "ips": [{"$group": {"_id": "$ip", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                    {"$limit": 10}]
+        }}
+    ]
 
-    Displays:
-    - The total number of logs.
-    - The count of logs for each HTTP method in the
-    list ["GET", "POST", "PUT", "PATCH", "DELETE"].
-    - The number of logs where method is "GET" and path is "/status".
-    - The top 10 most present IPs in the collection, sorted by frequency.
+
+def print_stats(total_logs, methods, status_check_count, top_ips):
     """
-    # Count the total number of documents in the
-    # collection and print the total number of logs
-    total_logs = mongo_collection.count_documents({})
-    # print(f"{mongo_collection.estimated_document_count()} logs")
+    Display the Nginx log stats.
+
+    Parameters:
+    total_logs (int): The total number of logs.
+    methods (dict): The number of logs per HTTP method.
+    status_check_count (int): The number of logs
+    where method is "GET" and path is "/status".
+    top_ips (list): The top 10 IPs, as documents with
+    the IP in "_id" and its number of logs in "count".
+    """
+    # Print the total number of logs
     print(f"{total_logs} logs")
 
     # Print/display the number of logs per/for each method
     print("Methods:")
     for method in METHODS:
-        # Count the number of documents for each HTTP method
-        count = mongo_collection.count_documents({"method": method})
-        print(f"\tmethod {method}: {count}")
+        print(f"\tmethod {method}: {methods.get(method, 0)}")
 
-    # Count and print the number of logs/documents
+    # Print the number of logs/documents
     # where method is "GET" and path is "/status"
-    status_check_count = mongo_collection.count_documents({"method": "GET",
-                                                           "path": "/status"})
     print(f"{status_check_count} status check")
 
-    # Aggregate pipeline to get the top 10
-    # most present IPs, sorted by frequency
-    print("IPs:")
-    pipeline = [
-        # Group by IP and count occurrences
-        {"$group": {"_id": "$ip", "count": {"$sum": 1}}},
-        # Sort by count in descending order
-        {"$sort": {"count": -1}},
-        # Limit to top 10 IPs
-        {"$limit": 10}
-    ]
-    top_ips = mongo_collection.aggregate(pipeline)
-
     # Print/display the top 10 IPs with their counts
+    print("IPs:")
     for ip in top_ips:
         print(f"\t{ip['_id']}: {ip['count']}")
 
 
+def log_stats(mongo_collection):
+    """
+    Provide some stats about Nginx logs stored in MongoDB,
+    all computed in a single aggregation pass.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object (MongoDB
+    collection) containing the Nginx logs from which to retrieve stats,
+    or the path of a mongodump BSON file of the logs to read instead
+    (see 108-dump_log_stats.py).
+
+    Displays:
+    - The total number of logs.
+    - The count of logs for each HTTP method in the
+    list ["GET", "POST", "PUT", "PATCH", "DELETE"].
+    - The number of logs where method is "GET" and path is "/status".
+    - The top 10 most present IPs in the collection, sorted by frequency.
+    """
+    # Read the logs straight from a dump file, without a database
+    if isinstance(mongo_collection, str):
+        dump = __import__('108-dump_log_stats')
+        print_stats(*dump.dump_stats([mongo_collection]))
+        return
+
+    # Compute every number in a single aggregation pass, over
+    # the covering index when it exists (see 104-log_indexes.py)
+    options = {}
+    if STATS_INDEX in mongo_collection.index_information():
+        options["hint"] = STATS_INDEX
+    stats = next(mongo_collection.aggregate(stats_pipeline(), **options))
+    # $count outputs no document at all when nothing matches
+    total_logs = stats["total"][0]["count"] if stats["total"] else 0
+    methods = {method["_id"]: method["count"] for method in stats["methods"]}
+    status_check_count = \
+        stats["status"][0]["count"] if stats["status"] else 0
+
+    # Display the stats
+    print_stats(total_logs, methods, status_check_count, stats["ips"])
+
+
 if __name__ == "__main__":
     # Connect to MongoDB server and access the
     # 'nginx' collection within the 'logs' database
     client = MongoClient('mongodb://127.0.0.1:27017')
     nginx_collection = client.logs.nginx
 
-    # Call the 'log_stats' function to display the Nginx log stats
-    log_stats(nginx_collection)
+    # Call the 'log_stats' function to display the Nginx log stats,
+    # of a BSON dump file instead when one is given
+    log_stats(sys.argv[1] if len(sys.argv) > 1 else nginx_collection)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the single-pass `log_stats` of 102-log_stats.py.
+
+Loads the Nginx logs of dump.zip (dump/logs/nginx.bson) in a
+scratch collection, then runs the previous version of the stats,
+one query per number (total, 5 methods, status check and top
+IPs), and the single `$facet` aggregation, checking that both
+print the same stats and reporting the number of queries
+scanning the collection and the wall time of each.
+
+Usage: ./103-bench_log_stats.py [count] [--fake]
+- count: number of log documents loaded (default: the whole dump)
+- --fake: run against mongomock instead of a local mongod
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import zipfile
+
+import bson
+from pymongo import MongoClient
+
+log_stats = __import__('102-log_stats').log_stats
+METHODS = __import__('102-log_stats').METHODS
+
+# Archive holding the sample logs, next to this script
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dump.zip")
+
+
+class ScanCounter:
+    """
+    Wrapper around a collection counting the queries
+    that scan it (every read but the estimated count).
+    """
+
+    def __init__(self, collection):
+        """
+        Wrap a collection.
+
+        Parameters:
+        collection (Collection): The collection to wrap.
+        """
+        self.collection = collection
+        self.scans = 0
+
+    def __getattr__(self, name):
+        """
+        Return an attribute of the collection, counting
+        the calls to the methods reading it.
+        """
+        attribute = getattr(self.collection, name)
+        if name not in ("count_documents", "find", "aggregate"):
+            return attribute
+
+        def counted(*args, **kwargs):
+            """Count the scan and run the query."""
+            self.scans += 1
+            return attribute(*args, **kwargs)
+        return counted
+
+
+def load_dump(collection, count=None):
+    """
+    Replace the content of a collection with the logs of the dump.
+
+    Parameters:
+    collection (Collection): The collection to fill.
+    count (int): The number of logs to load (all if None).
+    """
+    with zipfile.ZipFile(DUMP) as archive:
+        logs = bson.decode_all(archive.read("dump/logs/nginx.bson"))
+    collection.drop()
+    collection.insert_many(logs[:count])
+
+
+def separate_queries(mongo_collection):
+    """
+    Print the stats of `log_stats` with one query per number,
+    as `log_stats` used to.
+
+    Parameters:
+    mongo_collection (Collection): The collection of logs.
+    """
+    print(f"{mongo_collection.count_documents({})} logs")
+    print("Methods:")
+    for method in METHODS:
+        count = mongo_collection.count_documents({"method": method})
+        print(f"\tmethod {method}: {count}")
+    status_check_count = mongo_collection.count_documents({"method": "GET",
+                                                           "path": "/status"})
+    print(f"{status_check_count} status check")
+    print("IPs:")
+    top_ips = mongo_collection.aggregate([
+        {"$group": {"_id": "$ip", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": 10}
+    ])
+    for ip in top_ips:
+        print(f"\t{ip['_id']}: {ip['count']}")
+
+
+def run(stats, collection):
+    """
+    Run a stats function on a collection, capturing its output.
+
+    Parameters:
+    stats (function): The function printing the stats.
+    collection (Collection): The collection of logs.
+
+    Returns:
+    tuple: The printed stats, the number of scans and
+    the wall time in seconds.
+    """
+    counter = ScanCounter(collection)
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        stats(counter)
+    return output.getvalue(), counter.scans, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else None
+    if "--fake" in sys.argv:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient('mongodb://127.0.0.1:27017')
+    collection = client.logs_bench.nginx
+    load_dump(collection, count)
+
+    before, before_scans, before_time = run(separate_queries, collection)
+    after, after_scans, after_time = run(log_stats, collection)
+    print(after, end="")
+    print(f"before: {before_scans} scans, {before_time:.3f}s")
+    print(f"after:  {after_scans} scan,  {after_time:.3f}s")
+    print(f"same stats: {before == after}")
+    collection.drop()
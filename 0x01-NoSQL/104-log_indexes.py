@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Index advisor for the Nginx log stats of 102-log_stats.py
+Database: logs, Collection: nginx
+- Creates the compound index covering every field the stats read
+  (method, path, ip) if it is missing
+- Explains each query the stats rely on and displays whether it
+  is covered (answered from the index alone) or scans documents
+"""
+
+from pymongo import MongoClient
+
+log_stats = __import__('102-log_stats')
+
+# Filters of the counts the stats are made of: one per HTTP method
+# and the status check, all prefixes of the covering index
+COUNT_FILTERS = [{"method": method} for method in log_stats.METHODS] + \
+    [{"method": "GET", "path": "/status"}]
+
+# Plan stages reading the index without fetching any document
+INDEX_STAGES = {"IXSCAN", "COUNT_SCAN", "DISTINCT_SCAN"}
+
+
+def ensure_indexes(mongo_collection):
+    """
+    Create the indexes supporting the log stats if they are missing.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object
+    containing the Nginx logs.
+
+    Returns:
+    list: The names of the indexes created.
+    """
+    # Look up the existing indexes by name
+    if log_stats.STATS_INDEX in mongo_collection.index_information():
+        return []
+    mongo_collection.create_index(log_stats.STATS_INDEX_KEYS,
+                                  name=log_stats.STATS_INDEX)
+    return [log_stats.STATS_INDEX]
+
+
+def plan_stages(explanation):
+    """
+    List the stages of the winning plans of an explain() output.
+
+    Parameters:
+    explanation (dict): The output of an explain command, of a
+    count or of an aggregation (classic or slot-based engine).
+
+    Returns:
+    list: The names of the stages, outermost first.
+    """
+    stages = []
+
+    def walk(node, winning):
+        """Collect the stages found under a winning plan."""
+        if isinstance(node, list):
+            for item in node:
+                walk(item, winning)
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                if key == "stage" and winning:
+                    stages.append(value)
+                walk(value, winning or key == "winningPlan")
+
+    walk(explanation, False)
+    return stages
+
+
+def is_covered(stages):
+    """
+    Tell whether a plan reads the index without touching documents.
+
+    Parameters:
+    stages (list): The stages of the plan.
+
+    Returns:
+    bool: True if the plan scans an index and fetches nothing.
+    """
+    return bool(INDEX_STAGES.intersection(stages)) and \
+        "FETCH" not in stages and "COLLSCAN" not in stages
+
+
+def explain_queries(mongo_collection):
+    """
+    Explain the queries behind the log stats.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object
+    containing the Nginx logs.
+
+    Returns:
+    list: A (query, stages) tuple per query, the stages being the
+    names of the stages of its winning plan.
+    """
+    db = mongo_collection.database
+    plans = []
+
+    # The counts per method and the status check
+    for query in COUNT_FILTERS:
+        explanation = db.command(
+            "explain", {"count": mongo_collection.name, "query": query},
+            verbosity="queryPlanner")
+        plans.append((f"count {query}", plan_stages(explanation)))
+
+    # The single pass computing every number at once, which is
+    # hinted to the covering index by log_stats when it exists
+    aggregate = {"aggregate": mongo_collection.name,
+                 "pipeline": log_stats.stats_pipeline(), "cursor": {}}
+    if log_stats.STATS_INDEX in mongo_collection.index_information():
+        aggregate["hint"] = log_stats.STATS_INDEX
+    explanation = db.command("explain", aggregate, verbosity="queryPlanner")
+    plans.append(("log_stats pipeline", plan_stages(explanation)))
+    return plans
+
+
+def advise_indexes(mongo_collection, create=True):
+    """
+    Create the missing indexes of the log stats (unless `create`
+    is False) and display whether each of their queries is covered.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object
+    containing the Nginx logs.
+    create (bool): Whether to create the missing indexes.
+
+    Returns:
+    bool: True if every query is covered.
+    """
+    if create:
+        for name in ensure_indexes(mongo_collection):
+            print(f"created index {name}")
+
+    all_covered = True
+    for query, stages in explain_queries(mongo_collection):
+        covered = is_covered(stages)
+        all_covered = all_covered and covered
+        print(f"{query}: {' > '.join(stages)} "
+              f"({'covered' if covered else 'NOT covered'})")
+    return all_covered
+
+
+if __name__ == "__main__":
+    # Connect to MongoDB server and access the
+    # 'nginx' collection within the 'logs' database
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs.nginx
+
+    # Create the missing indexes and report the query plans
+    advise_indexes(nginx_collection)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Provide the stats of 102-log_stats.py incrementally
+Database: logs, Collection: nginx
+- Running totals (total, per-method counts, status checks) are kept
+  in the summary collection nginx_stats, along with a checkpoint:
+  the _id below which every log is counted
+- The number of logs per IP is kept in nginx_stats_ips
+- Each run only aggregates the logs added after the checkpoint
+  and merges them into the totals, then displays the same stats
+  as a full recompute
+- The checkpoint only moves up to the _ids generated COMMIT_LAG
+  seconds ago, so logs inserted out of order by concurrent writers
+  are not skipped (newer logs are counted by a later run)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import MongoClient, UpdateOne
+
+log_stats = __import__('102-log_stats')
+
+# Identifier of the document holding the totals and the checkpoint
+TOTALS_ID = "totals"
+# Number of IP counters updated per bulk write
+BATCH_SIZE = 1000
+# Maximum number of seconds between the generation of the _id of a
+# log (by the inserting client) and the commit of its insert
+COMMIT_LAG = 60
+
+
+def checkpoint_bound(lag=COMMIT_LAG):
+    """
+    Return the highest checkpoint safe to move to: every log with a
+    lower _id is committed, provided its insert took at most `lag`
+    seconds.
+
+    Parameters:
+    lag (float): The maximum commit delay of an insert, in seconds.
+
+    Returns:
+    ObjectId: The smallest _id generated `lag` seconds ago.
+    """
+    return ObjectId.from_datetime(datetime.now(timezone.utc)
+                                  - timedelta(seconds=lag))
+
+
+def summary_collections(mongo_collection):
+    """
+    Return the collections holding the running totals of the stats.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+
+    Returns:
+    tuple: The summary collection (totals and checkpoint)
+    and the collection of the number of logs per IP.
+    """
+    db = mongo_collection.database
+    name = mongo_collection.name
+    return db[f"{name}_stats"], db[f"{name}_stats_ips"]
+
+
+def update_stats(mongo_collection, lag=COMMIT_LAG):
+    """
+    Merge the logs added since the last checkpoint into the
+    running totals, then move the checkpoint.
+
+    Logs are assumed to have ObjectIds generated by the inserting
+    clients and committed at most `lag` seconds later, possibly out
+    of order: only the logs with an older _id are counted.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    lag (float): The maximum commit delay of an insert, in seconds.
+
+    Returns:
+    dict: The totals document, with the "total", the "methods"
+    counts, the "status" checks and the checkpoint "until_id".
+    """
+    summary, ips = summary_collections(mongo_collection)
+    totals = summary.find_one({"_id": TOTALS_ID})
+
+    # A run stopped while merging leaves its batch pending: the IP
+    # counters may be partly updated, so recompute from scratch
+    if totals is not None and "pending" in totals:
+        summary.drop()
+        ips.drop()
+        totals = None
+
+    # Bound the batch to the logs that can no longer be preceded
+    # by an insert still in flight; newer ones are left for later
+    until_id = checkpoint_bound(lag)
+    last_id = totals["until_id"] if totals is not None else None
+    if last_id is not None and until_id <= last_id:
+        return totals
+    batch = {"_id": {"$lt": until_id}}
+    if last_id is not None:
+        batch["_id"]["$gte"] = last_id
+
+    # Count the new logs in a single pass
+    counts = next(mongo_collection.aggregate([
+        {"$match": batch},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "methods": [{"$match": {"method": {"$in": log_stats.METHODS}}},
+                        {"$group": {"_id": "$method", "count": {"$sum": 1}}}],
+            "status": [{"$match": {"method": "GET", "path": "/status"}},
+                       {"$count": "count"}]
+        }}
+    ]))
+
+    # Mark the batch as pending while the IP counters are merged
+    summary.update_one({"_id": TOTALS_ID},
+                       {"$set": {"pending": until_id}}, upsert=True)
+    requests = []
+    for ip in mongo_collection.aggregate([
+            {"$match": batch},
+            {"$group": {"_id": "$ip", "count": {"$sum": 1}}}]):
+        requests.append(UpdateOne({"_id": ip["_id"]},
+                                  {"$inc": {"count": ip["count"]}},
+                                  upsert=True))
+        if len(requests) == BATCH_SIZE:
+            ips.bulk_write(requests, ordered=False)
+            requests = []
+    if requests:
+        ips.bulk_write(requests, ordered=False)
+    ips.create_index([("count", -1), ("_id", 1)])
+
+    # Merge the totals and move the checkpoint in one update
+    increments = {
+        "total": counts["total"][0]["count"] if counts["total"] else 0,
+        "status": counts["status"][0]["count"] if counts["status"] else 0
+    }
+    for method in counts["methods"]:
+        increments[f"methods.{method['_id']}"] = method["count"]
+    summary.update_one({"_id": TOTALS_ID},
+                       {"$inc": increments,
+                        "$set": {"until_id": until_id},
+                        "$unset": {"pending": ""}})
+    return summary.find_one({"_id": TOTALS_ID})
+
+
+def incremental_log_stats(mongo_collection, lag=COMMIT_LAG):
+    """
+    Provide the stats of `log_stats` about Nginx logs stored in
+    MongoDB, only aggregating the logs added since the last run.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    lag (float): The maximum commit delay of an insert, in seconds:
+    the logs of the last `lag` seconds are counted by a later run.
+
+    Displays:
+    - The same stats as `log_stats`, up to the checkpoint.
+    """
+    totals = update_stats(mongo_collection, lag)
+    _, ips = summary_collections(mongo_collection)
+
+    # Same order as the full recompute: by count, then by IP
+    top_ips = ips.find().sort([("count", -1), ("_id", 1)]).limit(10)
+    log_stats.print_stats(totals["total"], totals.get("methods", {}),
+                          totals["status"], top_ips)
+
+
+if __name__ == "__main__":
+    # Connect to MongoDB server and access the
+    # 'nginx' collection within the 'logs' database
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs.nginx
+
+    # Display the Nginx log stats, updated since the last run
+    incremental_log_stats(nginx_collection)
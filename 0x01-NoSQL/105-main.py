@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+""" 105-main: check the incremental stats against a full recompute """
+import contextlib
+from functools import partial
+import io
+import sys
+import time
+import zipfile
+
+import bson
+from bson import ObjectId
+from pymongo import MongoClient
+log_stats = __import__('102-log_stats').log_stats
+incremental = __import__('105-incremental_log_stats')
+
+
+def output(stats, collection):
+    """ Return what a stats function prints """
+    captured = io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        stats(collection)
+    return captured.getvalue()
+
+
+if __name__ == "__main__":
+    if "--fake" in sys.argv:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs_check.nginx
+    nginx_collection.drop()
+    for collection in incremental.summary_collections(nginx_collection):
+        collection.drop()
+
+    with zipfile.ZipFile("dump.zip") as archive:
+        logs = bson.decode_all(archive.read("dump/logs/nginx.bson"))[:20000]
+    # Insert the logs with new _ids, as an ingester would
+    for log in logs:
+        del log["_id"]
+    # Count every log inserted before the current second
+    incremental_log_stats = partial(incremental.incremental_log_stats, lag=0)
+
+    # Empty collection, then logs appended in batches, then no change
+    batches = [[], logs[:1], logs[1:5000], logs[5000:12000], logs[12000:], []]
+    for batch in batches:
+        if batch:
+            nginx_collection.insert_many(batch)
+            time.sleep(1)
+        full = output(log_stats, nginx_collection)
+        incremental_output = output(incremental_log_stats, nginx_collection)
+        print(f"{nginx_collection.count_documents({})} logs: "
+              f"{incremental_output == full}")
+
+    # A run stopped while merging is recomputed from scratch
+    summary, ips = incremental.summary_collections(nginx_collection)
+    summary.update_one({"_id": incremental.TOTALS_ID},
+                       {"$set": {"pending": logs[-1]["_id"]}})
+    ips.update_one({"_id": logs[0]["ip"]}, {"$inc": {"count": 1000}})
+    incremental_output = output(incremental_log_stats, nginx_collection)
+    print(f"after an interrupted run: {incremental_output == full}")
+
+    # A log committed after a newer one (concurrent writers) is
+    # still counted: the checkpoint stays COMMIT_LAG seconds behind
+    older = dict(logs[0], _id=ObjectId())
+    time.sleep(1)
+    newer = dict(logs[1], _id=ObjectId())
+    nginx_collection.insert_one(newer)
+    incremental.update_stats(nginx_collection)
+    nginx_collection.insert_one(older)
+    # Once the lag has passed, both are counted
+    time.sleep(1)
+    full = output(log_stats, nginx_collection)
+    incremental_output = output(incremental_log_stats, nginx_collection)
+    print(f"after an out-of-order insert: {incremental_output == full}")
+
+    print(incremental_output, end="")
+    client.drop_database("logs_check")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Ingest Nginx access logs into MongoDB
+Database: logs, Collection: nginx
+- Reads access-log files (or follows them, like `tail -f`) as a
+  stream of lines
+- Parses each line into the documents 12-log_stats.py reports on:
+  {ip, method, path, date}
+- Writes them with unordered insert_many in bounded batches across
+  a pool of workers, blocking the reader when the workers fall
+  behind (backpressure)
+- When following a file, a batch is written once FLUSH_INTERVAL
+  seconds have passed even if it is not full
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import re
+import sys
+import threading
+import time
+
+from pymongo import MongoClient
+
+# Line of the default "combined" Nginx log format, e.g.
+# 172.31.2.14 - - [22/Feb/2018:03:51:02 +0000] "GET /status HTTP/1.1" ...
+LOG_LINE = re.compile(
+    r'(?P<ip>\S+) \S+ \S+ \[(?P<date>[^\] ]+)[^\]]*\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)[^"]*"')
+
+# Number of documents written per insert_many
+BATCH_SIZE = 1000
+# Number of batches being written at the same time
+WORKERS = 4
+# Number of seconds between two reads of a followed file at its end
+FOLLOW_INTERVAL = 0.5
+# Maximum number of seconds a document waits in a partial batch
+FLUSH_INTERVAL = 2.0
+
+
+def parse_line(line):
+    """
+    Parse an Nginx access-log line into a log document.
+
+    Parameters:
+    line (str): The log line.
+
+    Returns:
+    dict: The document with the "ip", "method", "path" and "date"
+    of the request, or None if the line is not a request log.
+    """
+    match = LOG_LINE.match(line)
+    if match is None:
+        return None
+    return match.groupdict()
+
+
+def read_logs(paths, follow=False):
+    """
+    Yield the log documents of access-log files, in order.
+
+    Parameters:
+    paths (list): The paths of the log files.
+    follow (bool): Whether to keep reading the last file as it
+    grows, like `tail -f`, instead of stopping at its end.
+
+    Yields:
+    dict: The document of each request log line. When following,
+    None is also yielded each time the end of the file is reached,
+    so that the consumer can write what it holds while waiting.
+    """
+    for index, path in enumerate(paths):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            following = follow and index == len(paths) - 1
+            # Start of a line still being written to a followed file
+            partial = ""
+            while True:
+                line = f.readline()
+                if not line.endswith("\n") and following:
+                    # Wait for more lines (or the end of this one)
+                    partial += line
+                    yield None
+                    time.sleep(FOLLOW_INTERVAL)
+                    continue
+                if not line:
+                    break
+                line, partial = partial + line, ""
+                document = parse_line(line)
+                if document is not None:
+                    yield document
+
+
+def batches(documents, size=BATCH_SIZE, max_delay=FLUSH_INTERVAL):
+    """
+    Group a stream of documents into lists of at most `size`.
+
+    A partial batch is also yielded once its first document has
+    waited `max_delay` seconds, checked at each item of the stream,
+    including the None items `read_logs` yields while following.
+
+    Parameters:
+    documents (iterable): The documents, and None items.
+    size (int): The maximum number of documents per batch.
+    max_delay (float): The maximum number of seconds a document
+    waits in a partial batch.
+
+    Yields:
+    list: The batches of documents.
+    """
+    batch = []
+    started = None
+    for document in documents:
+        if document is not None:
+            if not batch:
+                started = time.monotonic()
+            batch.append(document)
+        if batch and (len(batch) == size or
+                      time.monotonic() - started >= max_delay):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(mongo_collection, documents, workers=WORKERS,
+           batch_size=BATCH_SIZE):
+    """
+    Insert a stream of documents in a collection with unordered
+    insert_many batches written by a pool of workers.
+
+    At most `2 * workers` batches are held in memory: reading
+    the stream blocks until a worker is done with a batch.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object.
+    documents (iterable): The documents to insert.
+    workers (int): The number of batches written at the same time.
+    batch_size (int): The maximum number of documents per batch.
+
+    Returns:
+    int: The number of documents inserted.
+    """
+    in_flight = threading.BoundedSemaphore(2 * workers)
+    inserted = 0
+
+    def write(batch):
+        """Insert a batch, then let the reader queue another one."""
+        try:
+            return len(mongo_collection.insert_many(
+                batch, ordered=False).inserted_ids)
+        finally:
+            in_flight.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for batch in batches(documents, batch_size):
+            in_flight.acquire()
+            futures.append(executor.submit(write, batch))
+            # Collect the finished batches, raising their errors
+            pending = []
+            for future in futures:
+                if future.done():
+                    inserted += future.result()
+                else:
+                    pending.append(future)
+            futures = pending
+        for future in futures:
+            inserted += future.result()
+    return inserted
+
+
+if __name__ == "__main__":
+    # Usage: ./106-log_ingester.py access.log [...] [--follow]
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+
+    # Connect to MongoDB server and access the
+    # 'nginx' collection within the 'logs' database
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs.nginx
+
+    count = ingest(nginx_collection,
+                   read_logs(paths, follow="--follow" in sys.argv))
+    print(f"{count} logs inserted")
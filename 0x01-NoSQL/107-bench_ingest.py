@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the log ingester of 106-log_ingester.py.
+
+Writes a synthetic Nginx access log of the given size, then
+ingests it with one insert_one per document (as insert_school
+does) and with insert_many batches across 1 and 4 workers,
+and reports the throughput of each in documents per second.
+The insert_one run is limited to the first 20000 lines.
+
+Usage: ./107-bench_ingest.py [megabytes] [--fake]
+- megabytes: size of the synthetic log (default 64, e.g. 4096
+  for a multi-GB log)
+- --fake: run against mongomock instead of a local mongod
+"""
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+from pymongo import MongoClient
+
+ingester = __import__('106-log_ingester')
+
+# Number of lines inserted one by one
+INSERT_ONE_LINES = 20000
+
+METHODS = ["GET"] * 90 + ["POST"] * 6 + ["PUT", "PATCH", "DELETE", "HEAD"]
+PATHS = ["/status", "/", "/api/v1/users", "/login", "/static/app.js"]
+
+
+def write_log(path, size):
+    """
+    Write a synthetic access log of about `size` bytes.
+
+    Parameters:
+    path (str): The path of the log file.
+    size (int): The size of the log in bytes.
+
+    Returns:
+    int: The number of lines written.
+    """
+    rng = random.Random(0)
+    ips = [f"10.{rng.randrange(256)}.{rng.randrange(256)}.{i % 256}"
+           for i in range(5000)]
+    written = lines = 0
+    with open(path, "w") as f:
+        while written < size:
+            chunk = "".join(
+                f'{rng.choice(ips)} - - [22/Feb/2018:03:51:{i % 60:02d} '
+                f'+0000] "{rng.choice(METHODS)} {rng.choice(PATHS)} '
+                f'HTTP/1.1" 200 612 "-" "curl/7.47.0"\n'
+                for i in range(10000))
+            f.write(chunk)
+            written += len(chunk)
+            lines += 10000
+    return lines
+
+
+def insert_one_by_one(mongo_collection, documents):
+    """
+    Insert documents with one insert_one each.
+
+    Parameters:
+    mongo_collection (Collection): The pymongo collection object.
+    documents (iterable): The documents to insert.
+
+    Returns:
+    int: The number of documents inserted.
+    """
+    count = 0
+    for document in documents:
+        mongo_collection.insert_one(document)
+        count += 1
+    return count
+
+
+def run(label, collection, ingest):
+    """
+    Time an ingestion into an empty collection and print its
+    throughput.
+
+    Parameters:
+    label (str): The name of the ingestion method.
+    collection (Collection): The collection to fill.
+    ingest (function): The function ingesting the logs into
+    the collection and returning the number of documents.
+    """
+    collection.drop()
+    start = time.perf_counter()
+    count = ingest(collection)
+    elapsed = time.perf_counter() - start
+    print(f"{label:24} {count:9d} docs in {elapsed:7.2f}s, "
+          f"{count / elapsed:9.0f} docs/sec")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    size = int(args[0] if args else 64) * 2 ** 20
+    if "--fake" in sys.argv:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient('mongodb://127.0.0.1:27017')
+    collection = client.logs_bench.nginx
+
+    fd, path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    try:
+        lines = write_log(path, size)
+        print(f"log: {lines} lines, {os.path.getsize(path) / 2 ** 20:.0f} MiB")
+        run("insert_one", collection, lambda c: insert_one_by_one(
+            c, itertools.islice(ingester.read_logs([path]),
+                                INSERT_ONE_LINES)))
+        for workers in (1, 4):
+            run(f"insert_many, {workers} worker(s)", collection,
+                lambda c: ingester.ingest(c, ingester.read_logs([path]),
+                                          workers=workers))
+    finally:
+        os.remove(path)
+        collection.drop()
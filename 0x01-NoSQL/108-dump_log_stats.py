@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Provide the stats of 102-log_stats.py from a mongodump BSON file
+Source: dump/logs/nginx.bson (from dump.zip) or any other dump of
+the Nginx logs, no database needed
+- Documents are streamed from the memory-mapped file
+- Counts are kept compactly: IPv4 addresses as integers
+"""
+
+import bson
+from collections import Counter
+import heapq
+import mmap
+import os
+import socket
+import sys
+
+log_stats = __import__('102-log_stats')
+
+# Default dump of the logs, once dump.zip is extracted
+DUMP_PATH = os.path.join("dump", "logs", "nginx.bson")
+
+
+def iter_dump(path):
+    """
+    Stream the documents of a BSON dump file.
+
+    The file is memory-mapped: each document is decoded in place
+    from the page cache, so files much larger than the memory can
+    be read at disk speed.
+
+    Parameters:
+    path (str): The path of the .bson file.
+
+    Yields:
+    dict: Each document of the dump, in order.
+    """
+    # An empty file cannot be memory-mapped (and holds no document)
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if hasattr(data, "madvise"):
+            data.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(data)
+        try:
+            offset = 0
+            while offset < len(data):
+                # Each document starts with its size (int32, little endian)
+                size = int.from_bytes(data[offset:offset + 4], "little")
+                yield bson.decode(view[offset:offset + size])
+                offset += size
+        finally:
+            view.release()
+
+
+def pack_ip(ip):
+    """
+    Return a compact key for an IP: an integer for IPv4 addresses.
+
+    Parameters:
+    ip (str): The IP address.
+
+    Returns:
+    The integer of an IPv4 address, or the IP itself otherwise.
+    """
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except (OSError, TypeError):
+        return ip
+
+
+def unpack_ip(key):
+    """
+    Return the IP of a key made by `pack_ip`.
+
+    Parameters:
+    key: The key of the IP.
+
+    Returns:
+    str: The IP address.
+    """
+    if isinstance(key, int):
+        return socket.inet_ntop(socket.AF_INET, key.to_bytes(4, "big"))
+    return key
+
+
+def dump_stats(paths):
+    """
+    Compute the stats of `log_stats` over BSON dump files.
+
+    Parameters:
+    paths (list): The paths of the .bson files.
+
+    Returns:
+    tuple: The total number of logs, the number of logs per
+    method, the number of status checks and the top 10 IPs (as
+    documents with the IP in "_id" and its count in "count").
+    """
+    total = status_check_count = 0
+    methods = Counter()
+    ips = Counter()
+    for path in paths:
+        for log in iter_dump(path):
+            total += 1
+            method = log.get("method")
+            methods[method] += 1
+            if method == "GET" and log.get("path") == "/status":
+                status_check_count += 1
+            ips[pack_ip(log.get("ip"))] += 1
+
+    # Sort by count in descending order, then by IP like log_stats
+    # (a missing IP first), only unpacking the IPs that can make
+    # it to the top 10
+    counts = heapq.nlargest(10, ips.values())
+    candidates = [(-count, unpack_ip(key)) for key, count in ips.items()
+                  if count >= counts[-1]] if counts else []
+    candidates.sort(key=lambda ip: (ip[0], ip[1] is not None, ip[1] or ""))
+    top_ips = [{"_id": ip, "count": -count} for count, ip in candidates[:10]]
+    return total, methods, status_check_count, top_ips
+
+
+def dump_log_stats(paths):
+    """
+    Provide the stats of `log_stats` about Nginx logs read from
+    mongodump BSON files instead of a collection.
+
+    Parameters:
+    paths (list): The paths of the .bson files.
+
+    Displays:
+    - The same stats as `log_stats`.
+    """
+    log_stats.print_stats(*dump_stats(paths))
+
+
+if __name__ == "__main__":
+    # Usage: ./108-dump_log_stats.py [file.bson ...]
+    dump_log_stats(sys.argv[1:] or [DUMP_PATH])
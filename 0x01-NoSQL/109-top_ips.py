@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Top 10 most present IPs in the Nginx logs stored in MongoDB
+Database: logs, Collection: nginx
+- Approximate mode: streams the IPs of the collection through a
+  Space-Saving summary holding a bounded number of counters, with
+  counts overestimated by at most `error` times the number of logs
+- Exact mode: groups by IP over the "ip" index, spilling to disk
+  when the groups do not fit in memory (allowDiskUse)
+"""
+
+import heapq
+import math
+import sys
+
+from pymongo import MongoClient
+
+# Index of the IPs, used to group them without reading the documents
+IP_INDEX_KEYS = [("ip", 1)]
+IP_INDEX = "ip_1"
+# Default bound of the approximate counts, relative to the
+# number of logs (0.1% keeps 1000 counters)
+DEFAULT_ERROR = 0.001
+# Number of documents fetched per round trip when streaming
+BATCH_SIZE = 10000
+
+
+def ip_order(ip):
+    """
+    Sort key of IPs by count in descending order, then by IP
+    (a missing IP first), like 102-log_stats.py.
+
+    Parameters:
+    ip (tuple): The count and the IP.
+
+    Returns:
+    tuple: The sort key.
+    """
+    count, key = ip
+    return -count, key is not None, key or ""
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent items of a stream,
+    with at most `capacity` counters.
+
+    Each counter overestimates the count of its item by at most its
+    `errors` entry, itself at most `total / capacity`: every item
+    seen more often than that is guaranteed to have a counter.
+    """
+
+    def __init__(self, capacity):
+        """
+        Create an empty summary.
+
+        Parameters:
+        capacity (int): The maximum number of counters.
+        """
+        self.capacity = capacity
+        self.total = 0
+        # Count and overestimation of each monitored item
+        self.counts = {}
+        self.errors = {}
+        # Items by count, to find one with the smallest count in O(1)
+        self.buckets = {}
+        self.min_count = 0
+
+    def add(self, item):
+        """
+        Count an occurrence of an item.
+
+        Parameters:
+        item: The item seen in the stream.
+        """
+        self.total += 1
+        count = self.counts.get(item)
+        if count is None:
+            if len(self.counts) < self.capacity:
+                # A free counter: the item starts from 0, exactly
+                count = self.errors[item] = 0
+            else:
+                # Take over the counter of an item with the smallest
+                # count, which the new item may have had at most
+                count = self.min_count
+                bucket = self.buckets[count]
+                evicted = bucket.pop()
+                del self.counts[evicted]
+                del self.errors[evicted]
+                self.errors[item] = count
+        else:
+            bucket = self.buckets[count]
+            bucket.discard(item)
+        if count in self.buckets and not self.buckets[count]:
+            del self.buckets[count]
+
+        self.counts[item] = count + 1
+        self.buckets.setdefault(count + 1, set()).add(item)
+        if count == 0:
+            self.min_count = 1
+        elif self.min_count not in self.buckets:
+            # The last item with the smallest count moved up by one
+            self.min_count = count + 1
+
+    def top(self, k):
+        """
+        Return the `k` items with the highest counts.
+
+        Parameters:
+        k (int): The number of items.
+
+        Returns:
+        list: (count, item, error) tuples, the true count of the item
+        being between `count - error` and `count`.
+        """
+        top = heapq.nsmallest(k, ((count, item) for item, count
+                                  in self.counts.items()), key=ip_order)
+        return [(count, item, self.errors[item]) for count, item in top]
+
+
+def approximate_top_ips(mongo_collection, k=10, error=DEFAULT_ERROR):
+    """
+    Find the most present IPs while streaming the collection,
+    in memory bounded by `1 / error` counters.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    k (int): The number of IPs.
+    error (float): The maximum overestimation of the counts,
+    relative to the number of logs.
+
+    Returns:
+    list: The top IPs, as documents with the IP in "_id", its
+    (over)estimated number of logs in "count" and the maximum
+    overestimation in "error".
+    """
+    summary = SpaceSaving(max(k, math.ceil(1 / error)))
+    options = {}
+    # Read the IPs from the index alone when it exists
+    if IP_INDEX in mongo_collection.index_information():
+        options["hint"] = IP_INDEX
+    cursor = mongo_collection.find({}, {"_id": 0, "ip": 1}, **options)
+    for log in cursor.batch_size(BATCH_SIZE):
+        summary.add(log.get("ip"))
+    return [{"_id": ip, "count": count, "error": overestimation}
+            for count, ip, overestimation in summary.top(k)]
+
+
+def exact_top_ips(mongo_collection, k=10):
+    """
+    Find the most present IPs exactly, grouping the IPs over the
+    "ip" index (created if missing) and letting MongoDB spill the
+    groups to disk when they do not fit in memory.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    k (int): The number of IPs.
+
+    Returns:
+    list: The top IPs, as documents with the IP in "_id"
+    and its number of logs in "count".
+    """
+    mongo_collection.create_index(IP_INDEX_KEYS, name=IP_INDEX)
+    pipeline = [
+        # Only read the IPs, from the index
+        {"$project": {"_id": 0, "ip": 1}},
+        {"$group": {"_id": "$ip", "count": {"$sum": 1}}},
+        # $sort followed by $limit only keeps the top k in memory
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": k}
+    ]
+    return list(mongo_collection.aggregate(pipeline, allowDiskUse=True,
+                                           hint=IP_INDEX))
+
+
+if __name__ == "__main__":
+    # Usage: ./109-top_ips.py [--exact]
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs.nginx
+
+    print("IPs:")
+    if "--exact" in sys.argv:
+        for ip in exact_top_ips(nginx_collection):
+            print(f"\t{ip['_id']}: {ip['count']}")
+    else:
+        for ip in approximate_top_ips(nginx_collection):
+            print(f"\t{ip['_id']}: {ip['count']} "
+                  f"(at most {ip['error']} too many)")
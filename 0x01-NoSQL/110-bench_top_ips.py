@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the top 10 IPs modes of 109-top_ips.py.
+
+Loads the Nginx logs of dump.zip in a scratch collection, then
+finds the top 10 IPs with the pipeline of 102-log_stats.py, the
+approximate mode (at two error bounds) and the exact mode, and
+reports the wall time, the peak memory allocated by the client,
+the number of counters kept and the largest count error of each.
+Server-side memory is not measured: the approximate mode only
+streams a cursor, the others group every distinct IP on the server
+(with --fake, that "server" runs in the client and is counted).
+
+Usage: ./110-bench_top_ips.py [count] [--fake]
+- count: number of log documents loaded (default: the whole dump)
+- --fake: run against mongomock instead of a local mongod
+"""
+import sys
+import time
+import tracemalloc
+
+from pymongo import MongoClient
+
+load_dump = __import__('103-bench_log_stats').load_dump
+top_ips = __import__('109-top_ips')
+
+
+def current_pipeline(mongo_collection):
+    """
+    Find the top 10 IPs like the stats of 102-log_stats.py.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+
+    Returns:
+    list: The top IPs, with the IP in "_id" and its count in "count".
+    """
+    return list(mongo_collection.aggregate([
+        {"$group": {"_id": "$ip", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": 10}
+    ]))
+
+
+def run(label, find, collection, exact=None):
+    """
+    Time a way of finding the top IPs and print its cost.
+
+    Parameters:
+    label (str): The name of the mode.
+    find (function): The function finding the top IPs.
+    collection (Collection): The collection of Nginx logs.
+    exact (dict): The exact count of each IP, to compare with.
+
+    Returns:
+    list: The top IPs found.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    found = find(collection)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    line = f"{label:24} {elapsed:7.3f}s, client peak {peak / 2 ** 10:8.0f} KiB"
+    if exact is not None:
+        error = max(abs(ip["count"] - exact.get(ip["_id"], 0))
+                    for ip in found)
+        line += f", max count error {error}"
+    print(line)
+    return found
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else None
+    if "--fake" in sys.argv:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient('mongodb://127.0.0.1:27017')
+    collection = client.logs_bench.nginx
+    load_dump(collection, count)
+    exact = {ip["_id"]: ip["count"] for ip in collection.aggregate(
+        [{"$group": {"_id": "$ip", "count": {"$sum": 1}}}])}
+    print(f"{collection.count_documents({})} logs, {len(exact)} IPs")
+
+    run("current pipeline", current_pipeline, collection, exact)
+    for error in (0.01, 0.001):
+        run(f"approximate, error {error}",
+            lambda c: top_ips.approximate_top_ips(c, error=error),
+            collection, exact)
+    run("exact, ip index", top_ips.exact_top_ips, collection, exact)
+    collection.drop()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Time-bucketed rollups of the Nginx logs stored in MongoDB
+Database: logs, Collection: nginx, Rollups: nginx_rollups
+- Counts the logs per minute and per hour: in total, by method and
+  the status checks (method=GET, path=/status); by path and by IP
+  per hour only, as these have one bucket per distinct value
+- Rollups are updated incrementally: each update only reads the logs
+  added after a checkpoint (the _id below which every log is
+  counted, kept COMMIT_LAG seconds behind like 105) and upserts
+  their counts into the buckets
+- Range stats and time series are answered from the rollups alone,
+  and can be checked against the raw logs
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+import sys
+
+from pymongo import ASCENDING, MongoClient, UpdateOne
+
+incremental = __import__('105-incremental_log_stats')
+
+# Length of the buckets of each interval, in seconds
+INTERVALS = {"minute": 60, "hour": 3600}
+# Dimensions counted in the buckets of each interval
+INTERVAL_FIELDS = {
+    "minute": ("total", "status", "method"),
+    "hour": ("total", "status", "method", "path", "ip")
+}
+# Format of the "date" field of the logs (UTC)
+DATE_FORMAT = "%d/%b/%Y:%H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+# Identifier of the document holding the checkpoint
+CHECKPOINT_ID = "checkpoint"
+# Number of logs counted in memory before their counts are written
+BATCH_SIZE = 100000
+
+
+def rollup_collection(mongo_collection):
+    """
+    Return the collection of the rollups of a collection of logs.
+
+    A rollup document counts the logs of one bucket ("interval" and
+    "start" time, None for logs without a valid date) for one
+    dimension ("field") of `INTERVAL_FIELDS`: "total", "status",
+    or a "value" of "method", "path" or "ip".
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+
+    Returns:
+    Collection: The rollup collection.
+    """
+    return mongo_collection.database[f"{mongo_collection.name}_rollups"]
+
+
+def floor_time(moment, seconds):
+    """
+    Return the start of the bucket holding a time.
+
+    Parameters:
+    moment (datetime): The time.
+    seconds (int): The length of the buckets.
+
+    Returns:
+    datetime: The start of the bucket.
+    """
+    elapsed = int((moment - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def bucket_start(date, seconds):
+    """
+    Return the start of the bucket of a log date.
+
+    Parameters:
+    date (str): The "date" of the log.
+    seconds (int): The length of the buckets.
+
+    Returns:
+    datetime: The start of the bucket, or None for an invalid date.
+    """
+    try:
+        return floor_time(datetime.strptime(date, DATE_FORMAT), seconds)
+    except (TypeError, ValueError):
+        return None
+
+
+def count_log(counts, log):
+    """
+    Add a log to the counts of its buckets.
+
+    Parameters:
+    counts (Counter): The counts by (interval, start, field, value).
+    log (dict): The log document.
+    """
+    method, path = log.get("method"), log.get("path")
+    values = {"total": None, "method": method, "path": path,
+              "ip": log.get("ip")}
+    if method == "GET" and path == "/status":
+        values["status"] = None
+    for interval, seconds in INTERVALS.items():
+        start = bucket_start(log.get("date"), seconds)
+        for field in INTERVAL_FIELDS[interval]:
+            if field in values:
+                counts[interval, start, field, values[field]] += 1
+
+
+def write_counts(rollups, counts):
+    """
+    Add counts to the rollups, with one upsert per bucket dimension.
+
+    Parameters:
+    rollups (Collection): The rollup collection.
+    counts (Counter): The counts by (interval, start, field, value).
+    """
+    requests = [
+        UpdateOne({"interval": interval, "start": start,
+                   "field": field, "value": value},
+                  {"$inc": {"count": count}}, upsert=True)
+        for (interval, start, field, value), count in counts.items()]
+    if requests:
+        rollups.bulk_write(requests, ordered=False)
+
+
+def update_rollups(mongo_collection, lag=incremental.COMMIT_LAG):
+    """
+    Count the logs added since the last checkpoint into the
+    rollups, then move the checkpoint.
+
+    Logs are assumed to have ObjectIds generated by the inserting
+    clients and committed at most `lag` seconds later, possibly out
+    of order: only the logs with an older _id are counted.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    lag (float): The maximum commit delay of an insert, in seconds.
+
+    Returns:
+    int: The number of logs counted.
+    """
+    rollups = rollup_collection(mongo_collection)
+    checkpoint = rollups.find_one({"_id": CHECKPOINT_ID})
+
+    # An update stopped while writing leaves its batch pending: the
+    # counts may be partly written, so rebuild them from scratch
+    if checkpoint is not None and "pending" in checkpoint:
+        rollups.drop()
+        checkpoint = None
+    rollups.create_index([("interval", ASCENDING), ("start", ASCENDING),
+                          ("field", ASCENDING), ("value", ASCENDING)],
+                         unique=True)
+
+    # Bound the batch to the logs that can no longer be preceded
+    # by an insert still in flight; newer ones are left for later
+    until_id = incremental.checkpoint_bound(lag)
+    last_id = checkpoint["until_id"] if checkpoint is not None else None
+    if last_id is not None and until_id <= last_id:
+        return 0
+    batch = {"_id": {"$lt": until_id}}
+    if last_id is not None:
+        batch["_id"]["$gte"] = last_id
+
+    rollups.update_one({"_id": CHECKPOINT_ID},
+                       {"$set": {"pending": until_id}}, upsert=True)
+    counted = 0
+    counts = Counter()
+    projection = {"_id": 0, "method": 1, "path": 1, "ip": 1, "date": 1}
+    for log in mongo_collection.find(batch, projection):
+        count_log(counts, log)
+        counted += 1
+        # Write the counts every BATCH_SIZE logs to bound the memory
+        if counted % BATCH_SIZE == 0:
+            write_counts(rollups, counts)
+            counts = Counter()
+    write_counts(rollups, counts)
+    rollups.update_one({"_id": CHECKPOINT_ID},
+                       {"$set": {"until_id": until_id},
+                        "$unset": {"pending": ""}})
+    return counted
+
+
+def range_stats(mongo_collection, start=None, end=None, interval="minute",
+                fields=None):
+    """
+    Compute the stats of the logs between two times from the rollups.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    start (datetime): The start of the range (inclusive), or None.
+    end (datetime): The end of the range (exclusive), or None.
+    interval (str): The buckets to read, "minute" or "hour": the
+    range is rounded to them.
+    fields (list): The dimensions to aggregate, among the
+    `INTERVAL_FIELDS` of the interval (all of them by default).
+
+    Returns:
+    dict: For each field, the "total" number of logs and of "status"
+    checks, and the number of logs by "method", "path" and "ip".
+    Without a range, the logs without a valid date are counted too.
+    """
+    if fields is None:
+        fields = INTERVAL_FIELDS[interval]
+    missing = set(fields) - set(INTERVAL_FIELDS[interval])
+    if missing:
+        raise ValueError(f"{', '.join(sorted(missing))} not counted "
+                         f"per {interval}")
+    query = {"interval": interval, "field": {"$in": list(fields)}}
+    if start is not None or end is not None:
+        query["start"] = {}
+        if start is not None:
+            query["start"]["$gte"] = floor_time(start, INTERVALS[interval])
+        if end is not None:
+            query["start"]["$lt"] = end
+    stats = {field: 0 if field in ("total", "status") else {}
+             for field in fields}
+    for row in rollup_collection(mongo_collection).aggregate([
+            {"$match": query},
+            {"$group": {"_id": {"field": "$field", "value": "$value"},
+                        "count": {"$sum": "$count"}}}]):
+        field, value = row["_id"]["field"], row["_id"].get("value")
+        if field in ("total", "status"):
+            stats[field] = row["count"]
+        else:
+            stats[field][value] = row["count"]
+    return stats
+
+
+def time_series(mongo_collection, start, end, interval="minute",
+                field="total", value=None):
+    """
+    Return the counts of a dimension per bucket, for a dashboard.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+    start (datetime): The start of the range (inclusive).
+    end (datetime): The end of the range (exclusive).
+    interval (str): The buckets, "minute" or "hour".
+    field (str): The dimension: "total", "status", "method",
+    or "path" and "ip" for the hour buckets.
+    value: The method, path or IP counted.
+
+    Returns:
+    list: (start, count) tuples of the buckets with logs, in order.
+    """
+    rows = rollup_collection(mongo_collection).find(
+        {"interval": interval, "field": field, "value": value,
+         "start": {"$gte": start, "$lt": end}},
+        {"_id": 0, "start": 1, "count": 1}).sort("start", ASCENDING)
+    return [(row["start"], row["count"]) for row in rows]
+
+
+def check_rollups(mongo_collection):
+    """
+    Check the rollups against the raw logs up to the checkpoint:
+    every bucket of every interval must hold the counts of the logs
+    whose date falls in it, so a log counted in the wrong bucket is
+    reported too.
+
+    The raw logs are streamed and grouped by bucket client-side,
+    in memory proportional to the number of rollup documents.
+
+    Parameters:
+    mongo_collection (Collection): The collection of Nginx logs.
+
+    Returns:
+    list: The descriptions of the differences found (empty if
+    the rollups are consistent).
+    """
+    rollups = rollup_collection(mongo_collection)
+    checkpoint = rollups.find_one({"_id": CHECKPOINT_ID})
+    query = {}
+    if checkpoint is not None:
+        query = {"_id": {"$lt": checkpoint["until_id"]}}
+    elif mongo_collection.find_one():
+        return ["no rollups"]
+
+    # Bucket the raw logs in a single pass
+    expected = Counter()
+    projection = {"_id": 0, "method": 1, "path": 1, "ip": 1, "date": 1}
+    for log in mongo_collection.find(query, projection).batch_size(
+            BATCH_SIZE):
+        count_log(expected, log)
+
+    actual = Counter()
+    for row in rollups.find({"_id": {"$ne": CHECKPOINT_ID}}):
+        actual[row["interval"], row["start"], row["field"],
+               row.get("value")] = row["count"]
+
+    differences = []
+    for key in sorted(expected.keys() | actual.keys(), key=repr):
+        if expected[key] != actual[key]:
+            interval, start, field, value = key
+            differences.append(f"{interval} {start} {field} {value}: "
+                               f"{actual[key]} in rollups, "
+                               f"{expected[key]} in the logs")
+    return differences
+
+
+if __name__ == "__main__":
+    # Usage: ./111-log_rollups.py [--check]
+    client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs.nginx
+
+    print(f"{update_rollups(nginx_collection)} new logs counted")
+    if "--check" in sys.argv:
+        differences = check_rollups(nginx_collection)
+        for difference in differences:
+            print(difference)
+        print("rollups consistent" if not differences
+              else "rollups NOT consistent")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+""" 111-main: build the rollups, check them and query a range """
+from datetime import datetime
+import sys
+import time
+
+from pymongo import MongoClient
+load_dump = __import__('103-bench_log_stats').load_dump
+rollups = __import__('111-log_rollups')
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else None
+    if "--fake" in sys.argv:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient('mongodb://127.0.0.1:27017')
+    nginx_collection = client.logs_check.nginx
+    rollups.rollup_collection(nginx_collection).drop()
+    load_dump(nginx_collection, count)
+
+    # Count the logs in two updates, the second one incremental
+    logs = list(nginx_collection.find().sort("_id", -1).limit(100))
+    nginx_collection.delete_many(
+        {"_id": {"$in": [log["_id"] for log in logs]}})
+    print(f"{rollups.update_rollups(nginx_collection)} logs counted")
+    # Append them again with new _ids, as an ingester would, and
+    # count them once they are older than the current second
+    for log in logs:
+        del log["_id"]
+    nginx_collection.insert_many(logs)
+    time.sleep(1)
+    print(f"{rollups.update_rollups(nginx_collection, lag=0)} logs counted")
+    print(f"{rollups.update_rollups(nginx_collection, lag=0)} logs counted")
+    print(f"differences: {rollups.check_rollups(nginx_collection)}")
+    print(f"{rollups.rollup_collection(nginx_collection).count_documents({})}"
+          f" rollup documents")
+
+    start, end = datetime(2018, 2, 22, 4), datetime(2018, 2, 22, 6)
+    began = time.perf_counter()
+    stats = rollups.range_stats(nginx_collection, start, end, "hour")
+    print(f"hour buckets: {stats['total']} logs, {stats['status']} status "
+          f"checks, {stats['method']} in "
+          f"{(time.perf_counter() - began) * 1000:.1f}ms")
+    began = time.perf_counter()
+    stats = rollups.range_stats(nginx_collection, start, end)
+    print(f"minute buckets: {stats['total']} logs in "
+          f"{(time.perf_counter() - began) * 1000:.1f}ms")
+    dates = [rollups.bucket_start(log["date"], 1) for log in
+             nginx_collection.find({}, {"date": 1})]
+    print(f"raw logs: {sum(start <= date < end for date in dates)} logs")
+    print(rollups.time_series(nginx_collection, start, end, "hour"))
+    client.drop_database("logs_check")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the parallel stats of 112-parallel_log_stats.py.
+
+Loads the Nginx logs of dump.zip in a scratch collection, then
+computes the stats with log_stats and with 1, 2, 4 and 8 worker
+processes, checking that every run prints the same report and
+reporting the wall time of each.
+
+Usage: ./113-bench_parallel_stats.py [count] [--fake]
+- count: number of log documents loaded (default: the whole dump)
+- --fake: run against mongomock instead of a local mongod; the
+  workers are forked and read their own copy of the fake database
+"""
+import multiprocessing
+import sys
+
+from pymongo import MongoClient
+
+bench = __import__('103-bench_log_stats')
+parallel = __import__('112-parallel_log_stats')
+log_stats = __import__('102-log_stats').log_stats
+
+# Client of the benchmark, inherited by the forked workers
+client = None
+
+
+def connect():
+    """
+    Return the client of the benchmark, in a worker process.
+
+    Returns:
+    MongoClient: The client.
+    """
+    return client
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else None
+    if "--fake" in sys.argv:
+        import mongomock
+        multiprocessing.set_start_method("fork")
+        client = mongomock.MongoClient()
+        workers_connect = connect
+    else:
+        client = MongoClient(parallel.MONGO_URI)
+        workers_connect = None
+    collection = client.logs_bench.nginx
+    bench.load_dump(collection, count)
+
+    expected, _, elapsed = bench.run(log_stats, collection)
+    print(f"log_stats:  {elapsed:7.3f}s")
+    for workers in (1, 2, 4, 8):
+        output, _, elapsed = bench.run(
+            lambda c: parallel.parallel_log_stats(c, workers,
+                                                  workers_connect),
+            collection)
+        print(f"{workers} worker(s): {elapsed:7.3f}s, "
+              f"same stats: {output == expected}")
+    collection.drop()
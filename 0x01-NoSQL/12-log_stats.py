@@ -24,7 +24,8 @@ from pymongo import MongoClient
 
 def log_nginx_stats(mongo_collection):
     """
-    Provides some stats about Nginx logs stored in MongoDB.
+    Provides some stats about Nginx logs stored in MongoDB,
+    all computed in a single aggregation pass.
 
     Args:
     mongo_collection: The MongoDB collection containing the Nginx logs.
@@ -35,19 +36,36 @@ def log_nginx_stats(mongo_collection):
     list ["GET", "POST", "PUT", "PATCH", "DELETE"].
     - The number of logs where method is "GET" and path is "/status".
     """
+    # Compute every number in a single aggregation pass: the
+    # collection is scanned once and each $facet sub-pipeline
+    # works on that same stream of documents
+    pipeline = [
+        {"$facet": {
+            # Count the total number of documents
+            "total": [{"$count": "count"}],
+            # Count the number of documents per HTTP method
+            "methods": [{"$group": {"_id": "$method", "count": {"$sum": 1}}}],
+            # Count the documents where method is "GET"
+            # and path is "/status"
+            "status": [{"$match": {"method": "GET", "path": "/status"}},
+                       {"$count": "count"}]
+        }}
+    ]
+    stats = next(mongo_collection.aggregate(pipeline))
+    # $count outputs no document at all when nothing matches
+    total = stats["total"][0]["count"] if stats["total"] else 0
+    methods = {method["_id"]: method["count"] for method in stats["methods"]}
+    number_of_gets = stats["status"][0]["count"] if stats["status"] else 0
+
     # Print the total number of logs
-    print(f"{mongo_collection.estimated_document_count()} logs")
+    print(f"{total} logs")
 
     # Print the number of logs for each method
     print("Methods:")
     for method in ["GET", "POST", "PUT", "PATCH", "DELETE"]:
-        count = mongo_collection.count_documents({"method": method})
-        print(f"\tmethod {method}: {count}")
+        print(f"\tmethod {method}: {methods.get(method, 0)}")
 
-    # Count and print the number of logs
-    # where method is "GET" and path is "/status"
-    number_of_gets = mongo_collection.count_documents({"method": "GET",
-                                                       "path": "/status"})
+    # Print the number of logs where method is "GET" and path is "/status"
     print(f"{number_of_gets} status check")
 
 
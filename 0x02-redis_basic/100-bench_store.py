@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark of `Cache.store` throughput (stores/sec).
+
+Compares the pipelined `Cache.store` (a single round trip per
+call) against the previous behaviour where `count_calls`,
+`call_history` and `store` each talked to Redis directly
+(INCR + RPUSH + SET + RPUSH, i.e. four round trips per call).
+
+Usage: ./100-bench_store.py [count] [--fake]
+- count: number of stores per run (default 10000)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+import uuid
+
+exercise = __import__('exercise')
+
+
+class UnpipelinedCache(exercise.Cache):
+    """
+    Cache whose `store` issues its four Redis commands one by one,
+    reproducing the cost of the original decorators.
+    """
+
+    def store(self, data: exercise.Union[str, bytes, int, float]) -> str:
+        """
+        Store the data using one round trip per command.
+
+        Args:
+            data: The data to store in Redis.
+
+        Returns:
+            str: The randomly generated key.
+        """
+        name = exercise.Cache.store.__qualname__
+        self._redis.incr(name)
+        self._redis.rpush(f"{name}:inputs", str((data,)))
+        key = str(uuid.uuid4())
+        self._redis.set(key, data)
+        self._redis.rpush(f"{name}:outputs", key)
+        return key
+
+
+def bench(cache: exercise.Cache, count: int) -> float:
+    """
+    Time `count` calls to `cache.store` and return stores/sec.
+
+    Args:
+        cache (Cache): The cache instance to benchmark.
+        count (int): The number of values to store.
+
+    Returns:
+        float: The measured throughput in stores per second.
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        cache.store(i)
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else 10000
+    if "--fake" in sys.argv:
+        import fakeredis
+        exercise.redis.Redis = fakeredis.FakeRedis
+
+    before = bench(UnpipelinedCache(), count)
+    after = bench(exercise.Cache(), count)
+    print(f"before (4 round trips): {before:10.0f} stores/sec")
+    print(f"after  (1 round trip):  {after:10.0f} stores/sec")
+    print(f"speedup: {after / before:.2f}x")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark of `Cache` versus `AsyncCache`.
+
+Each caller stores a value and reads it back. The sync cache
+is driven by one thread per concurrent caller, the async cache
+by one task per caller on a single event loop. Throughput is
+reported in operations (store + get) per second at 1, 10 and
+100 concurrent callers.
+
+Usage: ./101-bench_async.py [operations] [--fake]
+- operations: number of store + get pairs per run (default 5000)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import time
+
+exercise = __import__('exercise')
+
+
+def bench_sync(concurrency: int, operations: int) -> float:
+    """
+    Run the operations on a `Cache` shared by `concurrency` threads.
+
+    Args:
+        concurrency (int): The number of concurrent callers.
+        operations (int): The total number of store + get pairs.
+
+    Returns:
+        float: The measured throughput in operations per second.
+    """
+    cache = exercise.Cache()
+
+    def work(i: int) -> None:
+        """Store a value and read it back."""
+        cache.get(cache.store(i))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(work, range(operations)))
+    return operations / (time.perf_counter() - start)
+
+
+async def bench_async(concurrency: int, operations: int) -> float:
+    """
+    Run the operations on an `AsyncCache` from `concurrency` tasks.
+
+    Args:
+        concurrency (int): The number of concurrent callers.
+        operations (int): The total number of store + get pairs.
+
+    Returns:
+        float: The measured throughput in operations per second.
+    """
+    cache = await exercise.AsyncCache.create()
+    per_task = operations // concurrency
+
+    async def work() -> None:
+        """Store values and read them back, one after the other."""
+        for i in range(per_task):
+            await cache.get(await cache.store(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[work() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    await cache.close()
+    return per_task * concurrency / elapsed
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    operations = int(args[0]) if args else 5000
+    if "--fake" in sys.argv:
+        import fakeredis
+        exercise.redis.Redis = fakeredis.FakeRedis
+        exercise.redis.asyncio.Redis = fakeredis.FakeAsyncRedis
+
+    print("callers        sync ops/sec       async ops/sec")
+    for concurrency in (1, 10, 100):
+        sync = bench_sync(concurrency, operations)
+        async_ = asyncio.run(bench_async(concurrency, operations))
+        print(f"{concurrency:7d} {sync:19.0f} {async_:19.0f}")
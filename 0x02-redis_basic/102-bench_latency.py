@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the latency instrumentation overhead.
+
+Measures the cost of `LatencyRecorder.record` on its own, then
+the throughput of `Cache.store` with and without a recorder,
+and finally prints the resulting latency report.
+
+Usage: ./102-bench_latency.py [count] [--fake]
+- count: number of calls per run (default 10000)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+
+exercise = __import__('exercise')
+
+
+def bench_store(cache: exercise.Cache, count: int) -> float:
+    """
+    Time `count` calls to `cache.store` and return stores/sec.
+
+    Args:
+        cache (Cache): The cache instance to benchmark.
+        count (int): The number of values to store.
+
+    Returns:
+        float: The measured throughput in stores per second.
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        cache.store(i)
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else 10000
+    if "--fake" in sys.argv:
+        import fakeredis
+        exercise.redis.Redis = fakeredis.FakeRedis
+
+    recorder = exercise.LatencyRecorder(flush_interval=3600)
+    start = time.perf_counter()
+    for i in range(count):
+        recorder.record("bench", i * 1e-7)
+    per_call = (time.perf_counter() - start) / count
+    print(f"LatencyRecorder.record: {per_call * 1e9:.0f} ns/call")
+
+    plain = bench_store(exercise.Cache(), count)
+    recorder = exercise.LatencyRecorder(flush_interval=1.0)
+    cache = exercise.Cache(latency_recorder=recorder)
+    timed = bench_store(cache, count)
+    recorder.flush()
+    print(f"store without recorder: {plain:10.0f} stores/sec")
+    print(f"store with recorder:    {timed:10.0f} stores/sec")
+    exercise.latency_report(cache._redis)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark of connection reuse across many `Cache` instances.
+
+Creates `count` short-lived caches that each store one value,
+first with a private client per instance (the previous
+behaviour), then on one shared connection pool, and reports
+the elapsed time and the number of connections opened.
+
+Usage: ./103-bench_pool.py [count] [--fake]
+- count: number of Cache instances per run (default 1000)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+
+exercise = __import__('exercise')
+
+
+def connections(pool) -> int:
+    """
+    Return the number of connections a pool has opened.
+
+    Args:
+        pool: The connection pool to inspect.
+
+    Returns:
+        int: The number of connections created by the pool.
+    """
+    return getattr(pool, "_created_connections", 0)
+
+
+def bench(count: int, make_cache) -> tuple:
+    """
+    Create `count` caches with `make_cache` and store one value each.
+
+    Args:
+        count (int): The number of caches to create.
+        make_cache (Callable): Builds a new Cache.
+
+    Returns:
+        tuple: The elapsed seconds and the set of pools used.
+    """
+    pools = set()
+    start = time.perf_counter()
+    for i in range(count):
+        cache = make_cache()
+        cache.store(i)
+        pools.add(cache._redis.connection_pool)
+    return time.perf_counter() - start, pools
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else 1000
+    pool_kwargs = {}
+    if "--fake" in sys.argv:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        exercise.redis.Redis = fakeredis.FakeRedis
+        pool_kwargs = {"connection_class": fakeredis.FakeConnection,
+                       "server": server}
+
+    elapsed, pools = bench(count, lambda: exercise.Cache(flush=False))
+    opened = sum(connections(pool) for pool in pools)
+    print(f"client per instance: {elapsed:.3f}s, "
+          f"{opened} connections opened")
+
+    shared = exercise.create_pool(max_connections=8, **pool_kwargs)
+    elapsed, pools = bench(count, lambda: exercise.Cache(pool=shared))
+    opened = sum(connections(pool) for pool in pools)
+    print(f"shared pool:         {elapsed:.3f}s, "
+          f"{opened} connections opened")
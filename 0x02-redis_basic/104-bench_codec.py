@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the `Codec` against redis-py's implicit coercion.
+
+For a few kinds of values, compares the payload size sent to
+Redis and the time to encode it and decode it back: with the
+current behaviour the value is coerced by redis-py's encoder
+and parsed by the reader's `fn` (`int`, `float`, UTF-8 decode);
+with the codec it is tagged, packed and possibly compressed.
+No Redis server is needed.
+
+Usage: ./104-bench_codec.py [count]
+- count: number of encode/decode rounds per value (default 100000)
+"""
+import sys
+import time
+
+import redis.connection
+
+exercise = __import__('exercise')
+
+SAMPLES = {
+    "small int": (123456789, int),
+    "float": (3.141592653589793, float),
+    "short str": ("hello world", exercise.to_str),
+    "bytes": (b"\x00\x01binary" * 4, None),
+    "html (8 KiB)": ("<p>lorem ipsum dolor</p>" * 340, exercise.to_str),
+}
+
+
+def timed(count: int, func, arg) -> float:
+    """
+    Return the mean duration of `func(arg)` in nanoseconds.
+
+    Args:
+        count (int): The number of calls to time.
+        func (Callable): The function to call.
+        arg: Its argument.
+
+    Returns:
+        float: The mean duration per call in nanoseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        func(arg)
+    return (time.perf_counter() - start) / count * 1e9
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    encoder = redis.connection.Encoder("utf-8", "strict", False)
+    codec = exercise.Codec()
+
+    print(f"{'value':14} {'size':>6} {'tagged':>6} "
+          f"{'enc ns':>8} {'tagged':>8} {'dec ns':>8} {'tagged':>8}")
+    for name, (value, fn) in SAMPLES.items():
+        raw = encoder.encode(value)
+        tagged = codec.encode(value)
+        print(f"{name:14} {len(raw):6d} {len(tagged):6d} "
+              f"{timed(count, encoder.encode, value):8.0f} "
+              f"{timed(count, codec.encode, value):8.0f} "
+              f"{timed(count, fn or bytes, raw):8.0f} "
+              f"{timed(count, codec.decode, tagged):8.0f}")
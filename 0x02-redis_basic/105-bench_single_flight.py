@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Check of the single-flight behaviour of `web.get_page`.
+
+Starts a local stub server with an artificial delay, then lets
+many threads request the same uncached URL at once, and reports
+how many requests reached the upstream and how many callers
+were coalesced onto another caller's fetch.
+
+Usage: ./105-bench_single_flight.py [callers] [--fake]
+- callers: number of concurrent callers (default 50)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+web = __import__('web')
+start_stub_server = __import__('stub_server').start_stub_server
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    callers = int(args[0]) if args else 50
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+    web.get_redis().flushdb()
+
+    server, url = start_stub_server(delay=0.5)
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        pages = list(pool.map(web.get_page, [url] * callers))
+
+    assert all(page == pages[0] for page in pages)
+    print(f"{callers} callers, {server.hits} upstream request(s)")
+    print(f"metrics: {web.stats}")
+    server.shutdown()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark of stale-while-revalidate in `web.get_page`.
+
+Reads one URL from a slow local stub server in a loop for a few
+seconds with a short soft TTL, first with hard expiry only (the
+previous behaviour: every expiry makes a caller wait for the
+upstream), then with stale-while-revalidate and early refresh,
+and prints the latency percentiles of both runs.
+
+Usage: ./106-bench_swr.py [seconds] [--fake]
+- seconds: duration of each run (default 5)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+
+web = __import__('web')
+start_stub_server = __import__('stub_server').start_stub_server
+
+
+def run(url: str, seconds: float) -> list:
+    """
+    Call `get_page` in a loop and collect the latencies.
+
+    Args:
+        url (str): The URL to read.
+        seconds (float): How long to keep reading.
+
+    Returns:
+        list: The sorted latencies in seconds, without
+        the first (cold cache) call.
+    """
+    web.get_redis().flushdb()
+    web.get_page(url)
+    latencies = []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        started = time.perf_counter()
+        web.get_page(url)
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.005)
+    return sorted(latencies)
+
+
+def report(name: str, latencies: list, hits: int) -> None:
+    """
+    Print the latency percentiles of a run.
+
+    Args:
+        name (str): The name of the run.
+        latencies (list): The sorted latencies in seconds.
+        hits (int): The number of upstream requests.
+    """
+    def pct(fraction: float) -> float:
+        """Return a percentile in milliseconds."""
+        return latencies[int(fraction * (len(latencies) - 1))] * 1e3
+
+    print(f"{name:24} p50 {pct(0.5):7.2f}ms  p99 {pct(0.99):7.2f}ms  "
+          f"max {latencies[-1] * 1e3:7.2f}ms  upstream {hits}")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    seconds = float(args[0]) if args else 5.0
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+
+    server, url = start_stub_server(delay=0.2)
+    web.CACHE_TTL = 1
+
+    web.STALE_TTL, web.EARLY_REFRESH_BETA = 0, 0.0
+    report("hard TTL only", run(url, seconds), server.hits)
+
+    server.hits = 0
+    web.STALE_TTL, web.EARLY_REFRESH_BETA = 10, 1.0
+    report("stale-while-revalidate", run(url + "/swr", seconds),
+           server.hits)
+    server.shutdown()
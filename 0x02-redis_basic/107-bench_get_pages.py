@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark of `web.get_pages` against a loop of `web.get_page`.
+
+Fetches many distinct URLs from a local stub server with an
+artificial delay, first one by one with `get_page`, then in one
+`get_pages` call, each on an empty cache, and reports the time
+taken and the number of upstream requests.
+
+Usage: ./107-bench_get_pages.py [urls] [concurrency] [--fake]
+- urls: number of distinct URLs (default 50)
+- concurrency: concurrency of `get_pages` (default 10)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+
+web = __import__('web')
+start_stub_server = __import__('stub_server').start_stub_server
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if len(args) > 0 else 50
+    concurrency = int(args[1]) if len(args) > 1 else 10
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+
+    server, base = start_stub_server(delay=0.05)
+    urls = [f"{base}/page/{i}" for i in range(count)]
+
+    web.get_redis().flushdb()
+    start = time.perf_counter()
+    sequential = [web.get_page(url) for url in urls]
+    elapsed = time.perf_counter() - start
+    print(f"get_page loop:  {elapsed:.3f}s, {server.hits} upstream")
+
+    server.hits = 0
+    web.get_redis().flushdb()
+    start = time.perf_counter()
+    batch = web.get_pages(urls, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    print(f"get_pages({concurrency}): {elapsed:.3f}s, {server.hits} upstream")
+
+    start = time.perf_counter()
+    web.get_pages(urls, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    print(f"get_pages, all cached: {elapsed:.3f}s")
+
+    assert batch == sequential
+    server.shutdown()
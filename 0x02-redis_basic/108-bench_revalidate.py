@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark of conditional revalidation in `web.get_page`.
+
+Reads a large page from a local stub server in a loop with a
+short soft TTL so it is refreshed many times, once from an
+upstream without validators and once from an upstream sending
+an ETag, and reports the upstream requests, 304 answers and
+body bytes transferred in both cases.
+
+Usage: ./108-bench_revalidate.py [seconds] [--fake]
+- seconds: duration of each run (default 5)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import sys
+import time
+
+web = __import__('web')
+start_stub_server = __import__('stub_server').start_stub_server
+
+# A page of about 1 MiB
+BODY = "<p>" + "x" * (1 << 20) + "</p>"
+
+
+def run(etag, seconds: float) -> None:
+    """
+    Read a page in a loop and print the upstream traffic.
+
+    Args:
+        etag (Optional[str]): The ETag sent by the upstream.
+        seconds (float): How long to keep reading.
+    """
+    web.get_redis().flushdb()
+    server, url = start_stub_server(BODY, etag=etag)
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        web.get_page(url)
+        time.sleep(0.01)
+    # Let the last background refresh finish
+    time.sleep(0.2)
+    print(f"etag={etag!s:6} upstream {server.hits:4d}, "
+          f"304s {server.not_modified:4d}, "
+          f"body bytes {server.bytes_sent / 2 ** 20:8.1f} MiB")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    seconds = float(args[0]) if args else 5.0
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+    web.CACHE_TTL = 1
+
+    run(None, seconds)
+    run('"v1"', seconds)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory taken by cached pages in `web`.
+
+Caches a sample corpus of HTML pages built from the text files
+of this repository, plus a few giant random responses,
+first stored as plain text with no size cap, then compressed
+and capped with the defaults, and reports the memory used, the
+pages admitted and the time taken to read them all back. The
+savings of compression (over the pages admitted by the cap) are
+reported apart from the bytes the cap keeps out of the cache.
+
+Usage: ./109-bench_page_storage.py [pages] [--fake]
+- pages: number of pages in the corpus (default 200)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+import glob
+import os
+import sys
+import time
+
+web = __import__('web')
+
+
+def corpus(count: int) -> dict:
+    """
+    Build a corpus of pages from the repository's text files,
+    wrapping 1 to 8 consecutive (distinct) files in some HTML
+    markup, so that no page repeats its own content.
+
+    Args:
+        count (int): The number of regular pages.
+
+    Returns:
+        dict: The page content of each URL.
+    """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    texts = []
+    for pattern in ("*.md", "*/*.py", "*/*.sql", "*/*.md"):
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            with open(path, encoding='utf-8') as f:
+                texts.append(f.read())
+    pages = {}
+    for i in range(count):
+        rows = "".join(f"<div class=\"row\"><pre>{texts[j % len(texts)]}"
+                       f"</pre></div>\n" for j in range(i, i + 1 + i % 8))
+        pages[f"http://corpus/{i}"] = \
+            f"<html><head><title>{i}</title></head><body>{rows}</body></html>"
+    # A few multi-megabyte responses that barely compress
+    for i in range(3):
+        pages[f"http://corpus/giant/{i}"] = os.urandom(3 << 20).hex()
+    return pages
+
+
+def memory(r, keys) -> list:
+    """
+    Return the memory used by each key, from `MEMORY USAGE`
+    or, where unsupported (fakeredis), the stored body sizes.
+
+    Args:
+        r (redis.Redis): The Redis client.
+        keys (list): The keys to measure.
+
+    Returns:
+        list: The number of bytes used by each key.
+    """
+    pipe = r.pipeline(transaction=False)
+    try:
+        for key in keys:
+            pipe.memory_usage(key)
+        return [size or 0 for size in pipe.execute()]
+    except web.redis.exceptions.ResponseError:
+        for key in keys:
+            pipe.hstrlen(key, "body")
+        return pipe.execute()
+
+
+def run(label: str, pages: dict) -> tuple:
+    """
+    Cache every page of the corpus, then print the memory used,
+    the pages admitted and the time taken to read them back.
+
+    Args:
+        label (str): The name of the configuration.
+        pages (dict): The page content of each URL.
+
+    Returns:
+        tuple: The number of bytes used by each URL, and the
+        set of the URLs admitted in the cache.
+    """
+    r = web.get_redis()
+    r.flushdb()
+    pipe = r.pipeline(transaction=False)
+    for url, html_content in pages.items():
+        web._queue_entry(pipe, url, html_content, 0.0)
+        pipe.execute()
+    keys = [f"cache:{url}" for url in pages]
+    admitted = {url for url, key in zip(pages, keys)
+                if r.hexists(key, "body")}
+    used = dict(zip(pages, memory(r, keys)))
+
+    start = time.perf_counter()
+    for url in pages:
+        entry = web._read_entry(r, url)
+        if entry is not None and not web._is_rejected(entry):
+            web._page_body(entry)
+    elapsed = time.perf_counter() - start
+    print(f"{label:22} {sum(used.values()) / 2 ** 20:8.2f} MiB, "
+          f"{len(admitted)}/{len(pages)} pages cached, "
+          f"read in {elapsed:.3f}s")
+    return used, admitted
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else 200
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+
+    pages = corpus(count)
+    size = sum(len(page.encode('utf-8')) for page in pages.values())
+    print(f"corpus: {len(pages)} pages, {size / 2 ** 20:.2f} MiB")
+
+    threshold, max_size = web.COMPRESS_THRESHOLD, web.MAX_PAGE_SIZE
+    web.COMPRESS_THRESHOLD = web.MAX_PAGE_SIZE = float("inf")
+    before, _ = run("plain, uncapped", pages)
+    web.COMPRESS_THRESHOLD, web.MAX_PAGE_SIZE = threshold, max_size
+    after, admitted = run("compressed, capped", pages)
+
+    plain = sum(before[url] for url in admitted)
+    compressed = sum(after[url] for url in admitted)
+    print(f"compression: {plain / 2 ** 20:.2f} MiB -> "
+          f"{compressed / 2 ** 20:.2f} MiB ({1 - compressed / plain:.0%} "
+          f"saved) over the {len(admitted)} pages admitted")
+    capped = sum(size for url, size in before.items() if url not in admitted)
+    print(f"size cap: {capped / 2 ** 20:.2f} MiB kept out of the cache, "
+          f"{web.stats['rejected']} pages rejected")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the bounded per-URL analytics of `web`.
+
+Records hits drawn from a Zipf-like distribution over many
+distinct URLs, from a pool of clients, and compares the keys
+kept and the top URLs reported by `web.top_urls` against exact
+counts (what one `count:{url}` key per URL would hold).
+
+Usage: ./110-bench_analytics.py [hits] [urls] [--fake]
+- hits: number of hits recorded (default 100000)
+- urls: number of distinct URLs (default 20000)
+- --fake: run against fakeredis instead of a local redis-server
+"""
+from collections import Counter
+import random
+import sys
+import time
+
+web = __import__('web')
+
+# Number of distinct clients and of hits recorded per call
+CLIENTS = 5000
+BATCH = 100
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    hits = int(args[0]) if len(args) > 0 else 100000
+    count = int(args[1]) if len(args) > 1 else 20000
+    if "--fake" in sys.argv:
+        import fakeredis
+        web.configure_redis(fakeredis.FakeRedis())
+    r = web.get_redis()
+    r.flushdb()
+
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(count)]
+    urls = [f"http://site/{i}" for i in range(count)]
+    exact = Counter()
+    clients = set()
+    start = time.perf_counter()
+    for _ in range(hits // BATCH):
+        batch = rng.choices(urls, weights, k=BATCH)
+        client = f"client-{rng.randrange(CLIENTS)}"
+        exact.update(batch)
+        clients.add(client)
+        web._track(batch, client)
+    elapsed = time.perf_counter() - start
+
+    print(f"{hits} hits on {len(exact)} URLs in {elapsed:.3f}s")
+    print(f"keys kept: {r.dbsize()} "
+          f"(vs {len(exact)} count:{{url}} keys), "
+          f"{r.zcard(web.HITS_KEY)} URLs tracked")
+    print(f"unique clients: {web.unique_clients()} "
+          f"estimated, {len(clients)} exact")
+    top = web.top_urls(10)
+    expected = exact.most_common(10)
+    print(f"top 10 matching the exact top 10: "
+          f"{len({url for url, _ in top} & {url for url, _ in expected})}")
+    for url, tracked in top:
+        print(f"  {url:22} {tracked:6d} hits (exact {exact[url]:6d})")
@@ -8,14 +8,151 @@ types of data (str, bytes, int, float) in the
 Redis database using randomly generated keys.
 """
 
+from abc import ABC, abstractmethod
+import atexit
+from contextlib import asynccontextmanager, contextmanager
+from collections import OrderedDict
+from contextvars import ContextVar
 from functools import wraps
+import inspect
+from itertools import islice
+import random
 import redis
-from typing import Callable, cast, Optional, TypeVar, Union
+import redis.asyncio
+import struct
+import threading
+import time
+from typing import (AsyncIterator, Callable, cast, Dict, IO, Iterable,
+                    Iterator, List, Optional, Tuple, TypeVar, Union)
 import uuid
+import zlib
 
 T = TypeVar('T', str, bytes, int, float, None)
 UnionOfTypes = Union[str, bytes, int, float, None]
 
+# Maximum number of keys sent in a single MSET/MGET command
+CHUNK_SIZE = 1000
+
+
+def chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    """
+    Split an iterable into consecutive lists of at most `size` items.
+
+    Args:
+        iterable (Iterable): The items to split.
+        size (int): The maximum length of each chunk.
+
+    Yields:
+        list: The next chunk of items.
+    """
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+@contextmanager
+def tracking_pipeline(instance) -> Iterator[redis.client.Pipeline]:
+    """
+    Yield the pipeline that collects every Redis write
+    made by a decorated call on the given instance.
+
+    The outermost decorator opens a transactional pipeline
+    and executes it once the wrapped method returns, so the
+    counter, the history entries and the method's own writes
+    all reach Redis in a single round trip. Nested decorators
+    (and the method itself) reuse that same pipeline.
+    If the method raises, the queued writes are discarded.
+
+    Args:
+        instance: The object whose `_redis` client is used.
+
+    Yields:
+        redis.client.Pipeline: The pipeline to queue writes on.
+    """
+    local = instance._local
+    pipe = getattr(local, "pipeline", None)
+    # A decorator further out already opened a pipeline: reuse it
+    if pipe is not None:
+        yield pipe
+        return
+
+    pipe = instance._redis.pipeline(transaction=True)
+    local.pipeline = pipe
+    try:
+        yield pipe
+        # Send every queued command in one round trip
+        pipe.execute()
+    finally:
+        local.pipeline = None
+        pipe.reset()
+
+
+@asynccontextmanager
+async def async_tracking_pipeline(instance):
+    """
+    Asynchronous counterpart of `tracking_pipeline`, used when
+    the decorated method is a coroutine function.
+
+    Args:
+        instance: The object whose `_redis` asyncio client is used.
+
+    Yields:
+        redis.asyncio.client.Pipeline: The pipeline to queue writes on.
+    """
+    local = instance._local
+    pipe = local.pipeline
+    # A decorator further out already opened a pipeline: reuse it
+    if pipe is not None:
+        yield pipe
+        return
+
+    pipe = instance._redis.pipeline(transaction=True)
+    local.pipeline = pipe
+    try:
+        yield pipe
+        # Send every queued command in one round trip
+        await pipe.execute()
+    finally:
+        local.pipeline = None
+        await pipe.reset()
+
+
+# Pipelines of the calls running in the current asyncio task, by
+# `TaskLocal` holder: a single variable, as contexts keep every
+# variable set in them alive. The dict is replaced, never mutated,
+# so that tasks sharing a context do not see each other's changes.
+_task_pipelines: ContextVar = ContextVar("task_pipelines", default={})
+
+
+class TaskLocal:
+    """
+    Holder for the pipeline of the current call that is
+    local to the running asyncio task rather than the thread,
+    since many tasks interleave on one event loop thread.
+    """
+
+    @property
+    def pipeline(self):
+        """
+        The pipeline opened for the call running in this task.
+        """
+        return _task_pipelines.get().get(self)
+
+    @pipeline.setter
+    def pipeline(self, value) -> None:
+        """
+        Set the pipeline for the call running in this task
+        (None once the call is done, which forgets the holder).
+        """
+        pipelines = dict(_task_pipelines.get())
+        if value is None:
+            pipelines.pop(self, None)
+        else:
+            pipelines[self] = value
+        _task_pipelines.set(pipelines)
+
 
 # @staticmethod
 def count_calls(method: Callable) -> Callable:
@@ -23,6 +160,11 @@ def count_calls(method: Callable) -> Callable:
     Decorator to count the number
     of times a method is called.
 
+    When the instance has a `counter_buffer`, increments are
+    accumulated in process and flushed later instead of being
+    sent with the call. When it has a `latency_recorder`, the
+    duration of each call is also added to its histogram.
+
     Args:
         method (Callable): The method to be decorated.
 
@@ -30,6 +172,35 @@ def count_calls(method: Callable) -> Callable:
         Callable: The wrapped method with
         counting functionality.
     """
+    # Generate the key for counting based
+    # on the method's qualified name
+    key = method.__qualname__
+
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            """
+            Coroutine wrapper that increments the count of method
+            calls and returns the original coroutine's result.
+
+            Args:
+                self: The instance of the class.
+                *args: Positional arguments passed to the method.
+                **kwargs: Keyword arguments passed to the method.
+
+            Returns:
+                The return value of the original coroutine.
+            """
+            started = time.perf_counter()
+            async with async_tracking_pipeline(self) as pipe:
+                count_call(self, pipe, key)
+                result = await method(self, *args, **kwargs)
+            record_latency(self, key, time.perf_counter() - started)
+            self._invalidate(key)
+            return result
+
+        return async_wrapper
+
     # Use wraps to preserve the original method's
     # attributes (name, docstring, etc.)
     @wraps(method)
@@ -46,32 +217,211 @@ def count_calls(method: Callable) -> Callable:
         Returns:
             The return value of the original method.
         """
-        # Generate the key for counting based
-        # on the method's qualified name
-        key = method.__qualname__
-        # Increment the count for this method in Redis
-        self._redis.incr(key)
-        # Call the original method and store the result
-        result = method(self, *args, **kwargs)
+        started = time.perf_counter()
+        with tracking_pipeline(self) as pipe:
+            # Queue (or buffer) the count increment for this method
+            count_call(self, pipe, key)
+            # Call the original method and store the result
+            result = method(self, *args, **kwargs)
+        # Time the whole call, including its Redis round trip
+        record_latency(self, key, time.perf_counter() - started)
+        # The counter changed, so a near-cached copy is stale
+        self._invalidate(key)
         # Return the original method's result
         return result
 
     return wrapper
 
 
+class HistoryPolicy:
+    """
+    Retention settings for the history kept by `call_history`.
+
+    With the defaults every call is recorded forever, exactly
+    like the plain `call_history` decorator. Setting any of the
+    limits bounds the memory used per method:
+    - `max_length` keeps only the most recent entries (LTRIM),
+    - `sample_rate` records each call with that probability,
+    - `max_entry_size` truncates each encoded entry,
+    - `compress_threshold` stores the entries of at least that
+    many characters compressed (see `Codec`), which `replay`
+    reads back transparently.
+    Bounded histories also keep a `<qualname>:calls` counter
+    so `replay` can report how many calls were dropped.
+
+    With `stream` set, each call is instead recorded as a single
+    Redis Streams entry in `<qualname>:history` holding its
+    inputs, output and latency (the entry ID carries the
+    timestamp), so inputs and outputs can never be misaligned
+    and other processes can consume the history incrementally.
+    `max_length` then trims the stream with `MAXLEN ~`.
+    """
+
+    def __init__(self, max_length: Optional[int] = None,
+                 sample_rate: float = 1.0,
+                 max_entry_size: Optional[int] = None,
+                 stream: bool = False,
+                 compress_threshold: Optional[int] = None):
+        """
+        Initialize the retention settings.
+
+        Args:
+            max_length (Optional[int]): The number of most
+            recent entries to keep, or None for no limit.
+            sample_rate (float): The probability that a
+            call is recorded, between 0 and 1.
+            max_entry_size (Optional[int]): The maximum length
+            of an encoded entry, or None for no limit.
+            stream (bool): Whether to record the history in a
+            Redis stream instead of two lists.
+            compress_threshold (Optional[int]): The entry length
+            from which entries are compressed, or None to never
+            compress.
+        """
+        self.max_length = max_length
+        self.sample_rate = sample_rate
+        self.max_entry_size = max_entry_size
+        self.stream = stream
+        self.compress_threshold = compress_threshold
+
+    @property
+    def bounded(self) -> bool:
+        """
+        Whether any retention limit is configured.
+        """
+        return (self.max_length is not None or self.sample_rate < 1
+                or self.max_entry_size is not None)
+
+    def encode(self, value) -> Union[str, bytes]:
+        """
+        Encode a history entry, compressed from `compress_threshold`
+        characters and truncated to `max_entry_size`.
+
+        Args:
+            value: The inputs tuple or the output to encode.
+
+        Returns:
+            Union[str, bytes]: The encoded entry, as bytes
+            when compressed.
+        """
+        entry = str(value)
+        limit = self.max_entry_size
+        threshold = self.compress_threshold
+        if threshold is not None and len(entry) >= threshold:
+            packed = Codec(compress_threshold=threshold).encode(entry)
+            # Keep the compressed entry unless it must be truncated
+            if limit is None or len(packed) <= limit:
+                return packed
+        if limit is not None and len(entry) > limit:
+            entry = entry[:max(limit - 3, 0)] + "..."
+        return entry
+
+    def record(self, pipe, name: str, inputs: list, outputs: list,
+               latency: float = 0.0) -> None:
+        """
+        Queue the history entries of some calls on a pipeline,
+        applying sampling, encoding and trimming.
+
+        Args:
+            pipe: The pipeline to queue the writes on.
+            name (str): The qualified name of the method.
+            inputs (list): The positional arguments of each call.
+            outputs (list): The return value of each call.
+            latency (float): The duration of each call in seconds.
+        """
+        pairs = list(zip(inputs, outputs))
+        if self.bounded:
+            pipe.incrby(f"{name}:calls", len(pairs))
+        if self.sample_rate < 1:
+            pairs = [pair for pair in pairs
+                     if random.random() < self.sample_rate]
+        if not pairs:
+            return
+        if self.stream:
+            for args, output in pairs:
+                pipe.xadd(f"{name}:history",
+                          {"input": self.encode(args),
+                           "output": self.encode(output),
+                           "latency": f"{latency:.6f}"},
+                          maxlen=self.max_length, approximate=True)
+            return
+        pipe.rpush(f"{name}:inputs",
+                   *[self.encode(args) for args, _ in pairs])
+        pipe.rpush(f"{name}:outputs",
+                   *[self.encode(output) for _, output in pairs])
+        if self.max_length is not None:
+            pipe.ltrim(f"{name}:inputs", -self.max_length, -1)
+            pipe.ltrim(f"{name}:outputs", -self.max_length, -1)
+
+
+def resolve_history_policy(instance, default: HistoryPolicy) -> HistoryPolicy:
+    """
+    Return the history policy configured on an instance,
+    falling back to the one given to the decorator.
+
+    Args:
+        instance: The object whose method is being tracked.
+        default (HistoryPolicy): The decorator's policy.
+
+    Returns:
+        HistoryPolicy: The policy to apply.
+    """
+    policy = getattr(instance, "history_policy", None)
+    return policy if policy is not None else default
+
+
 # @staticmethod
-def call_history(method: Callable) -> Callable:
+def call_history(method: Optional[Callable] = None,
+                 **retention) -> Callable:
     """
     Decorator to store the history of inputs and outputs
     for a particular function/method in Redis.
 
+    It can be used bare (`@call_history`) or with retention
+    settings (`@call_history(max_length=1000)`), which are
+    passed to `HistoryPolicy`. A `history_policy` attribute on
+    the instance, when set, overrides the decorator's settings.
+
     Args:
         method (Callable): The function to be decorated.
+        **retention: The `HistoryPolicy` settings.
 
     Returns:
         Callable: The wrapped function (decorated method)
         with input and output history tracking.
     """
+    if method is None:
+        return lambda method: call_history(method, **retention)
+
+    # The base name of the inputs and outputs
+    # keys is the method's qualified name
+    name = method.__qualname__
+    default_policy = HistoryPolicy(**retention)
+
+    if inspect.iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            """Coroutine wrapper that stores
+            inputs and outputs in Redis.
+
+            Args:
+                self: The instance of the AsyncCache class.
+                *args: Positional arguments passed to the method.
+                **kwargs: Keyword arguments passed to the method.
+
+            Returns:
+                The return value of the coroutine.
+            """
+            async with async_tracking_pipeline(self) as pipe:
+                started = time.perf_counter()
+                output = await method(self, *args, **kwargs)
+                resolve_history_policy(self, default_policy).record(
+                    pipe, name, [args], [output],
+                    time.perf_counter() - started)
+            return output
+
+        async_wrapper.history_policy = default_policy
+        return async_wrapper
 
     @wraps(method)
     def wrapper(self, *args, **kwargs):
@@ -86,41 +436,832 @@ def call_history(method: Callable) -> Callable:
         Returns:
             The return value of the method.
         """
-        # Define base keys for inputs and outputs
-        # using the method's qualified name
-        key_inputs = f"{method.__qualname__}:inputs"
-        key_outputs = f"{method.__qualname__}:outputs"
-        # Store the input arguments as a
-        # string in the Redis list for inputs
-        self._redis.rpush(key_inputs, str(args))
-        # Call the original method and store the output
-        output = method(self, *args, **kwargs)
-        # Store the output in the Redis list for outputs
-        self._redis.rpush(key_outputs, str(output))
+        with tracking_pipeline(self) as pipe:
+            # Call the original method and store the output
+            started = time.perf_counter()
+            output = method(self, *args, **kwargs)
+            # Queue the input arguments and the output as
+            # strings in the Redis lists for inputs and outputs
+            # (same pipeline, so nothing is sent before this)
+            resolve_history_policy(self, default_policy).record(
+                pipe, name, [args], [output],
+                time.perf_counter() - started)
         # Return the output
         return output
 
+    # Expose the settings for bulk callers such as `store_many`
+    wrapper.history_policy = default_policy
     return wrapper
 
 
-class Cache:
+class NearCache:
+    """
+    Bounded in-process LRU cache kept in front of Redis.
+
+    Entries hold the raw bytes returned by Redis and are evicted
+    least-recently-used first once the total size of the cached
+    values exceeds `max_bytes`. Each entry also expires `ttl`
+    seconds after it was cached (never if `ttl` is None).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None):
+        """
+        Initialize an empty near cache.
+
+        Args:
+            max_bytes (int): The size budget of the cached values.
+            ttl (Optional[float]): The lifetime of an entry in
+            seconds, or None to keep entries until evicted.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (value, expiry time or None), oldest first
+        self._entries: 'OrderedDict[str, Tuple[bytes, Optional[float]]]' \
+            = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries currently cached.
+
+        Returns:
+            int: The number of cached entries.
+        """
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the cached value for a key, or None on a miss.
+
+        Args:
+            key (str): The Redis key to look up.
+
+        Returns:
+            Optional[bytes]: The cached raw value, if any.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None \
+                    and entry[1] <= time.monotonic():
+                # Expired: drop it and report a miss
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Cache a value, evicting the least recently used
+        entries until the size budget is respected.
+
+        Values larger than the whole budget are not cached.
+
+        Args:
+            key (str): The Redis key of the value.
+            value (bytes): The raw value returned by Redis.
+        """
+        with self._lock:
+            self._discard(key)
+            if len(value) > self.max_bytes:
+                return
+            expires = None if self.ttl is None \
+                else time.monotonic() + self.ttl
+            self._entries[key] = (value, expires)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Drop the given keys from the cache.
+
+        Args:
+            *keys (str): The Redis keys that were overwritten or deleted.
+        """
+        with self._lock:
+            for key in keys:
+                self._discard(key)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit/miss/eviction counters and current usage.
+
+        Returns:
+            Dict[str, int]: The cache statistics.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self),
+                "bytes": self.size}
+
+    def _discard(self, key: str) -> None:
+        """
+        Remove a key and release its size; the lock must be held.
+
+        Args:
+            key (str): The key to remove.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+
+class PeriodicFlusher(ABC):
+    """
+    Base of the in-process buffers flushed to Redis every
+    `flush_interval` seconds by a daemon thread, and at
+    interpreter exit, whether or not new data arrives.
+
+    Subclasses implement `flush`, which must keep its data
+    buffered when Redis fails so the next flush retries it.
+    `close` (or leaving a `with` block) stops the thread; until
+    then, the flusher stays referenced by its exit hook.
+    """
+
+    def __init__(self, client: Optional[redis.Redis],
+                 flush_interval: float):
+        """
+        Start the flush thread.
+
+        Args:
+            client (Optional[redis.Redis]): The synchronous client
+            used for flushing; `Cache` binds its own if None.
+            flush_interval (float): The number of seconds
+            between two flushes.
+        """
+        self.client = client
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        # Set to flush before the end of the interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{type(self).__name__}-flush",
+            daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "PeriodicFlusher":
+        """
+        Return the flusher, closed when the block exits.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the flusher.
+        """
+        self.close()
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Send the buffered data to Redis.
+        """
+
+    def wake(self) -> None:
+        """
+        Ask the flush thread to flush now, without waiting for it.
+        """
+        self._wake.set()
+
+    def try_flush(self) -> bool:
+        """
+        Flush, keeping the data buffered if Redis is unavailable.
+
+        Returns:
+            bool: Whether the flush succeeded.
+        """
+        try:
+            self.flush()
+        except redis.RedisError:
+            return False
+        return True
+
+    def close(self) -> None:
+        """
+        Stop the flush thread, flush the remaining data and drop
+        the exit hook. Closing again does nothing.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+        atexit.unregister(self.close)
+        self.try_flush()
+
+    def _run(self) -> None:
+        """
+        Flush every `flush_interval` seconds, or when woken up,
+        until closed.
+        """
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed.is_set():
+                return
+            self.try_flush()
+
+
+class CounterBuffer(PeriodicFlusher):
+    """
+    In-process buffer for the counters of `count_calls`.
+
+    Increments accumulate locally (thread-safely) and are sent
+    with one pipelined INCRBY per key every `flush_interval`
+    seconds, once `threshold` increments are pending, and at
+    interpreter exit, all from the flush thread, so counting never
+    waits on Redis. The Redis counters lag behind by up to one
+    flush.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None,
+                 flush_interval: float = 1.0, threshold: int = 1000):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            client (Optional[redis.Redis]): The synchronous client
+            used for flushing; `Cache` binds its own if None.
+            flush_interval (float): The maximum number of seconds
+            between two flushes.
+            threshold (int): The number of pending increments
+            that triggers a flush.
+        """
+        self.threshold = threshold
+        self._counts: Dict[str, int] = {}
+        self._pending = 0
+        super().__init__(client, flush_interval)
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        """
+        Buffer an increment of a counter, waking the flush
+        thread up if the threshold is reached.
+
+        Args:
+            key (str): The counter key.
+            amount (int): The value to add.
+        """
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + amount
+            self._pending += amount
+            due = self._pending >= self.threshold
+        if due:
+            self.wake()
+
+    def flush(self) -> None:
+        """
+        Send the buffered increments to Redis, putting them
+        back in the buffer if the pipeline fails.
+        """
+        if self.client is None:
+            return
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            self._pending = 0
+        if not counts:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, amount in counts.items():
+            pipe.incrby(key, amount)
+        try:
+            pipe.execute()
+        except redis.RedisError:
+            with self._lock:
+                for key, amount in counts.items():
+                    self._counts[key] = self._counts.get(key, 0) + amount
+                    self._pending += amount
+            raise
+
+
+def count_call(instance, pipe, key: str, amount: int = 1) -> None:
+    """
+    Count calls of a method, through the instance's counter
+    buffer if it has one, or on the call's pipeline otherwise.
+
+    Args:
+        instance: The object whose method was called.
+        pipe: The pipeline of the current call.
+        key (str): The counter key.
+        amount (int): The number of calls to count.
+    """
+    buffer = getattr(instance, "counter_buffer", None)
+    if buffer is not None:
+        buffer.incr(key, amount)
+    elif amount == 1:
+        pipe.incr(key)
+    else:
+        pipe.incrby(key, amount)
+
+
+# Upper bound (in microseconds, as a power of two)
+# of the last latency histogram bucket
+MAX_LATENCY_BUCKET = 2 ** 30
+# Set of the method names with a latency histogram
+LATENCY_METHODS_KEY = "latency:methods"
+
+
+def latency_bucket(seconds: float) -> int:
+    """
+    Return the log-scale histogram bucket of a duration: the
+    smallest power of two of microseconds not below it.
+
+    Args:
+        seconds (float): The duration to classify.
+
+    Returns:
+        int: The bucket's upper bound in microseconds.
+    """
+    micros = int(seconds * 1e6)
+    return min(1 << max(micros - 1, 0).bit_length(), MAX_LATENCY_BUCKET)
+
+
+class LatencyRecorder(PeriodicFlusher):
+    """
+    In-process latency histograms for the methods decorated
+    with `count_calls`, flushed to Redis periodically.
+
+    Durations are aggregated locally and written every
+    `flush_interval` seconds (and at interpreter exit) with one
+    pipelined HINCRBY per bucket into the `<qualname>:latency`
+    hash, so the hot path never waits on Redis. The hash also
+    holds `first` and `last` flush timestamps to derive the
+    call rate.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None,
+                 flush_interval: float = 5.0):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            client (Optional[redis.Redis]): The synchronous client
+            used for flushing; `Cache` binds its own if None.
+            flush_interval (float): The number of seconds
+            between two flushes.
+        """
+        self._histograms: Dict[str, Dict[int, int]] = {}
+        # Wall-clock time of the first call aggregated since the
+        # last flush, which starts the measured time span
+        self._since = time.time()
+        super().__init__(client, flush_interval)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Add a call duration to the local histogram of a method,
+        written to Redis by the next flush.
+
+        Args:
+            name (str): The qualified name of the method.
+            seconds (float): The duration of the call.
+        """
+        bucket = latency_bucket(seconds)
+        with self._lock:
+            if not self._histograms:
+                self._since = time.time()
+            histogram = self._histograms.setdefault(name, {})
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    def flush(self) -> None:
+        """
+        Write the locally aggregated histograms to Redis, putting
+        them back in the recorder if the pipeline fails.
+        """
+        if self.client is None:
+            return
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+            since = self._since
+        if not histograms:
+            return
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for name, histogram in histograms.items():
+            key = f"{name}:latency"
+            for bucket, count in histogram.items():
+                pipe.hincrby(key, str(bucket), count)
+            pipe.hsetnx(key, "first", since)
+            pipe.hset(key, "last", now)
+            pipe.sadd(LATENCY_METHODS_KEY, name)
+        try:
+            pipe.execute()
+        except redis.RedisError:
+            with self._lock:
+                if self._histograms:
+                    since = min(since, self._since)
+                self._since = since
+                for name, histogram in histograms.items():
+                    merged = self._histograms.setdefault(name, {})
+                    for bucket, count in histogram.items():
+                        merged[bucket] = merged.get(bucket, 0) + count
+            raise
+
+
+def record_latency(instance, name: str, seconds: float) -> None:
+    """
+    Record a call duration if the instance has a latency recorder.
+
+    Args:
+        instance: The object whose method was called.
+        name (str): The qualified name of the method.
+        seconds (float): The duration of the call.
+    """
+    recorder = getattr(instance, "latency_recorder", None)
+    if recorder is not None:
+        recorder.record(name, seconds)
+
+
+def latency_percentile(histogram: Dict[int, int], fraction: float) -> int:
+    """
+    Return the bucket holding the given fraction of the calls.
+
+    Args:
+        histogram (Dict[int, int]): Call counts per bucket.
+        fraction (float): The percentile as a fraction (0.99 for p99).
+
+    Returns:
+        int: The bucket's upper bound in microseconds.
+    """
+    total = sum(histogram.values())
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= fraction * total:
+            return bucket
+    return 0
+
+
+def latency_report(client: redis.Redis,
+                   file: Optional[IO[str]] = None) -> None:
+    """
+    Print p50/p95/p99 latencies (in microseconds, as bucket upper
+    bounds) and calls/sec for every method with a histogram.
+
+    Args:
+        client (redis.Redis): The client to read the histograms with.
+        file (Optional[IO[str]]): The stream to write to,
+        defaulting to the standard output.
+    """
+    for name in sorted(client.smembers(LATENCY_METHODS_KEY)):
+        name = name.decode('utf-8')
+        fields = client.hgetall(f"{name}:latency")
+        first = float(fields.pop(b"first"))
+        last = float(fields.pop(b"last"))
+        histogram = {int(bucket): int(count)
+                     for bucket, count in fields.items()}
+        calls = sum(histogram.values())
+        rate = calls / (last - first) if last > first else 0.0
+        print(f"{name}: {calls} calls, {rate:.1f} calls/sec, "
+              f"p50 {latency_percentile(histogram, 0.50)}us, "
+              f"p95 {latency_percentile(histogram, 0.95)}us, "
+              f"p99 {latency_percentile(histogram, 0.99)}us", file=file)
+
+
+class Codec:
+    """
+    Binary serialization of cached values tagged with their type,
+    so `get` can return the original `str`, `bytes`, `int` or
+    `float` without a caller-supplied conversion function.
+
+    Each encoded value starts with the reserved `MAGIC` prefix, so
+    values written without a codec are told apart and returned
+    unchanged by `decode`, then with a one-byte type tag:
+    - `b`: raw bytes, stored as is,
+    - `s`: a UTF-8 encoded string,
+    - `i`: an integer as a signed 64-bit big-endian number,
+    - `I`: an integer too large for 64 bits, as decimal text,
+    - `f`: a float as an IEEE 754 double.
+    Payloads of at least `compress_threshold` bytes are compressed
+    (zlib by default) and prefixed with an extra `z` tag.
+    """
+
+    # Format marker and version of encoded values (a NUL byte
+    # first, which UTF-8 text and redis-py numbers never start with)
+    MAGIC = b"\x00C1"
+
+    def __init__(self, compress_threshold: Optional[int] = 1024,
+                 compress: Callable[[bytes], bytes] = zlib.compress,
+                 decompress: Callable[[bytes], bytes] = zlib.decompress):
+        """
+        Initialize the codec.
+
+        Args:
+            compress_threshold (Optional[int]): The payload size
+            from which values are compressed, or None to never
+            compress.
+            compress (Callable[[bytes], bytes]): The compression
+            function, e.g. from zstandard or lz4 if installed.
+            decompress (Callable[[bytes], bytes]): The matching
+            decompression function.
+        """
+        self.compress_threshold = compress_threshold
+        self.compress = compress
+        self.decompress = decompress
+
+    def encode(self, value: Union[str, bytes, int, float]) -> bytes:
+        """
+        Serialize a value into tagged (possibly compressed) bytes.
+
+        Args:
+            value (Union[str, bytes, int, float]): The value to encode.
+
+        Returns:
+            bytes: The encoded value.
+
+        Raises:
+            redis.exceptions.DataError: If the type is not supported.
+        """
+        if isinstance(value, bytes):
+            encoded = b"b" + value
+        elif isinstance(value, str):
+            encoded = b"s" + value.encode('utf-8')
+        elif isinstance(value, bool):
+            # Rejected like redis-py does, although bool is an int
+            raise redis.exceptions.DataError(
+                "Invalid input of type: 'bool'")
+        elif isinstance(value, int):
+            if -2 ** 63 <= value < 2 ** 63:
+                encoded = b"i" + struct.pack(">q", value)
+            else:
+                encoded = b"I" + str(value).encode('ascii')
+        elif isinstance(value, float):
+            encoded = b"f" + struct.pack(">d", value)
+        else:
+            raise redis.exceptions.DataError(
+                f"Invalid input of type: '{type(value).__name__}'")
+        if self.compress_threshold is not None \
+                and len(encoded) >= self.compress_threshold:
+            encoded = b"z" + self.compress(encoded)
+        return self.MAGIC + encoded
+
+    def decode(self, data: bytes) -> Union[str, bytes, int, float]:
+        """
+        Deserialize bytes produced by `encode` into the original value.
+
+        Data without the `MAGIC` prefix was not written by a codec
+        (e.g. stored by a plain `Cache`) and is returned unchanged.
+
+        Args:
+            data (bytes): The encoded value.
+
+        Returns:
+            Union[str, bytes, int, float]: The original value.
+
+        Raises:
+            ValueError: If the data does not carry a known tag.
+        """
+        if not data.startswith(self.MAGIC):
+            return data
+        data = data[len(self.MAGIC):]
+        if data[:1] == b"z":
+            data = self.decompress(data[1:])
+        tag, payload = data[:1], data[1:]
+        if tag == b"b":
+            return payload
+        if tag == b"s":
+            return payload.decode('utf-8')
+        if tag == b"i":
+            return struct.unpack(">q", payload)[0]
+        if tag == b"I":
+            return int(payload)
+        if tag == b"f":
+            return struct.unpack(">d", payload)[0]
+        raise ValueError(f"Unknown codec tag: {tag!r}")
+
+
+def to_str(data: Union[str, bytes, int, float]) -> str:
+    """
+    Convert a raw (bytes) or decoded value to a string.
+
+    Args:
+        data (Union[str, bytes, int, float]): The value to convert.
+
+    Returns:
+        str: The value as a string.
+    """
+    if isinstance(data, bytes):
+        return data.decode('utf-8')
+    return str(data)
+
+
+def create_pool(host: str = "localhost", port: int = 6379, db: int = 0,
+                unix_socket_path: Optional[str] = None,
+                max_connections: Optional[int] = None,
+                socket_keepalive: bool = True,
+                asynchronous: bool = False, **kwargs):
+    """
+    Create a connection pool to share between many `Cache`
+    (or, with `asynchronous`, `AsyncCache`) instances.
+
+    Args:
+        host (str): The Redis server host name.
+        port (int): The Redis server TCP port.
+        db (int): The database number.
+        unix_socket_path (Optional[str]): The path of a unix
+        socket to connect through instead of TCP.
+        max_connections (Optional[int]): The maximum number
+        of open connections, or None for no limit.
+        socket_keepalive (bool): Whether to enable TCP keepalive.
+        asynchronous (bool): Whether to create a `redis.asyncio` pool.
+        **kwargs: Extra connection settings passed to the pool.
+
+    Returns:
+        The `redis.ConnectionPool` (or `redis.asyncio.ConnectionPool`).
+    """
+    module = redis.asyncio if asynchronous else redis
+    if unix_socket_path is not None:
+        return module.ConnectionPool(
+            connection_class=module.UnixDomainSocketConnection,
+            path=unix_socket_path, db=db,
+            max_connections=max_connections, **kwargs)
+    return module.ConnectionPool(host=host, port=port, db=db,
+                                 max_connections=max_connections,
+                                 socket_keepalive=socket_keepalive,
+                                 **kwargs)
+
+
+class CacheBase:
+    """
+    Logic shared by `Cache` and `AsyncCache` that does not talk to
+    Redis: the codec, the near cache and the merging of MGET replies.
+
+    Subclasses set `_near` and `_codec`.
+    """
+
+    _near: Optional[NearCache] = None
+    _codec: Optional[Codec] = None
+
+    def _invalidate(self, *keys: str) -> None:
+        """
+        Drop overwritten or deleted keys from the near cache.
+
+        Args:
+            *keys (str): The keys to invalidate.
+        """
+        if self._near is not None:
+            self._near.invalidate(*keys)
+
+    def _encode(self, data: Union[str, bytes, int, float]
+                ) -> Union[str, bytes, int, float]:
+        """
+        Serialize a value with the codec, if one is configured.
+
+        Args:
+            data (Union[str, bytes, int, float]): The value to store.
+
+        Returns:
+            Union[str, bytes, int, float]: The value to send to Redis.
+        """
+        return data if self._codec is None else self._codec.encode(data)
+
+    def _decode(self, data: Optional[bytes]) -> Optional[UnionOfTypes]:
+        """
+        Deserialize a raw value with the codec, if one is configured.
+
+        Args:
+            data (Optional[bytes]): The raw value read from Redis.
+
+        Returns:
+            Optional[UnionOfTypes]: The original value, or None.
+        """
+        if data is None or self._codec is None:
+            return data
+        return self._codec.decode(data)
+
+    def _near_lookup(self, keys: List[str]) -> Tuple[list, List[int]]:
+        """
+        Look keys up in the near cache, if one is configured.
+
+        Args:
+            keys (List[str]): The keys to read.
+
+        Returns:
+            Tuple[list, List[int]]: The raw values found (None for
+            the misses) and the indexes of the keys to ask Redis for.
+        """
+        found = [None] * len(keys)
+        if self._near is not None:
+            found = [self._near.get(key) for key in keys]
+        return found, [i for i, data in enumerate(found) if data is None]
+
+    def _merge_fetched(self, keys: List[str], found: list,
+                       missing: List[int], fetched: list,
+                       fn: Optional[Callable] = None) -> list:
+        """
+        Merge the MGET reply for the near cache misses, fill the near
+        cache with it and decode (and convert with `fn`) every value.
+
+        Args:
+            keys (List[str]): The keys read.
+            found (list): The raw values from `_near_lookup`.
+            missing (List[int]): The indexes of the keys sent to MGET.
+            fetched (list): The MGET reply.
+            fn (Optional[Callable]): A callable used to convert
+            each existing value.
+
+        Returns:
+            list: The values in the order of `keys`, None if missing.
+        """
+        for i, data in zip(missing, fetched):
+            found[i] = data
+            if data is not None and self._near is not None:
+                self._near.put(keys[i], data)
+        values = []
+        for data in map(self._decode, found):
+            # Keep missing keys as None, like `get`
+            if data is not None and fn is not None:
+                data = fn(data)
+            values.append(data)
+        return values
+
+
+class Cache(CacheBase):
     """
     Cache class for storing and retrieving data
     in Redis with optional type conversion.
+
+    Values are stored as redis-py coerces them unless a `Codec`
+    is given, in which case they are tagged with their type and
+    `get` returns them as they were stored.
     """
 
-    def __init__(self):
+    def __init__(self, near_cache: Optional[NearCache] = None,
+                 history_policy: Optional[HistoryPolicy] = None,
+                 latency_recorder: Optional[LatencyRecorder] = None,
+                 counter_buffer: Optional[CounterBuffer] = None,
+                 client: Optional[redis.Redis] = None,
+                 pool: Optional[redis.ConnectionPool] = None,
+                 flush: Optional[bool] = None,
+                 codec: Optional[Codec] = None):
         """
         Initialize the Cache class by setting up a
         Redis client and flushing the database.
+
+        The client is the injected `client`, else one sharing the
+        given connection `pool`, else a new default `redis.Redis()`.
+        The database is only flushed by default in that last case;
+        pass `flush` to choose explicitly.
+
+        Args:
+            near_cache (Optional[NearCache]): An optional in-process
+            cache consulted by the `get` methods before Redis.
+            history_policy (Optional[HistoryPolicy]): Retention
+            settings for the history recorded by `call_history`.
+            latency_recorder (Optional[LatencyRecorder]): An optional
+            recorder of the latency of the `count_calls` methods.
+            counter_buffer (Optional[CounterBuffer]): An optional
+            buffer delaying the counter writes of `count_calls`.
+            client (Optional[redis.Redis]): An existing client to use.
+            pool (Optional[redis.ConnectionPool]): A shared connection
+            pool (see `create_pool`) to build the client on.
+            flush (Optional[bool]): Whether to flush the database.
+            codec (Optional[Codec]): An optional codec serializing
+            the stored values so `get` restores their type.
         """
-        # Create an instance of the Redis client
-        # (Initialize the Redis client) and
+        # Use the injected Redis client, or create an instance
+        # of the Redis client (on the shared pool if given), and
         # store it as a private instance variable
-        self._redis = redis.Redis()
+        if client is not None:
+            self._redis = client
+        elif pool is not None:
+            self._redis = redis.Redis(connection_pool=pool)
+        else:
+            self._redis = redis.Redis()
+        # Per-thread state holding the pipeline opened
+        # by the tracking decorators for the current call
+        self._local = threading.local()
+        # Optional in-process (L1) cache in front of Redis
+        self._near = near_cache
+        # Optional serialization of the stored values
+        self._codec = codec
+        # Retention of the call history, overriding the decorators'
+        self.history_policy = history_policy
+        # Optional latency histograms of the decorated methods
+        self.latency_recorder = latency_recorder
+        if latency_recorder is not None and latency_recorder.client is None:
+            latency_recorder.client = self._redis
+        # Optional local buffering of the call counters
+        self.counter_buffer = counter_buffer
+        if counter_buffer is not None and counter_buffer.client is None:
+            counter_buffer.client = self._redis
         # Flush the Redis database to remove any
         # existing data thereby ensuring a clean slate
-        self._redis.flushdb()
+        if flush is None:
+            flush = client is None and pool is None
+        if flush:
+            self._redis.flushdb()
 
     @count_calls
     @call_history
@@ -146,12 +1287,97 @@ class Cache:
         # assert isinstance(data, bytes), """Expected the value `data`
         # to be of the type `bytes`"""
 
-        # Store the data in Redis using the generated key
+        # Store the data in Redis using the generated key,
+        # queued on the decorators' pipeline when there is one
         # self._redis.mset({key: data})
-        self._redis.set(key, data)
+        self._writer().set(key, self._encode(data))
+        self._invalidate(key)
         # Return the generated key
         return key
 
+    def store_many(self, values: Iterable[Union[str, bytes, int, float]],
+                   chunk_size: int = CHUNK_SIZE) -> List[str]:
+        """
+        Store many values at once using MSET, generating
+        a random key for each of them.
+
+        Every value is tracked as if it had been passed to `store`:
+        the `Cache.store` counter is bumped once per value and the
+        inputs/outputs history lists receive one entry per value,
+        appended in bulk. Each chunk of values is sent in a single
+        round trip.
+
+        Args:
+            values (Iterable[Union[str, bytes, int, float]]):
+            The values to store in Redis.
+            chunk_size (int): The maximum number of values
+            sent to Redis in one MSET.
+
+        Returns:
+            List[str]: The generated keys, in the order of `values`.
+        """
+        name = Cache.store.__qualname__
+        keys = []
+        for chunk in chunks(values, chunk_size):
+            chunk_keys = [str(uuid.uuid4()) for _ in chunk]
+            with tracking_pipeline(self) as pipe:
+                # Same bookkeeping as `count_calls` and `call_history`
+                count_call(self, pipe, name, len(chunk))
+                pipe.mset(dict(zip(chunk_keys, map(self._encode, chunk))))
+                policy = resolve_history_policy(
+                    self, Cache.store.history_policy)
+                policy.record(pipe, name, [(value,) for value in chunk],
+                              chunk_keys)
+            self._invalidate(name, *chunk_keys)
+            keys.extend(chunk_keys)
+        return keys
+
+    def delete(self, *keys: str) -> int:
+        """
+        Delete keys from Redis and from the near cache.
+
+        Args:
+            *keys (str): The keys to delete.
+
+        Returns:
+            int: The number of keys that existed in Redis.
+        """
+        deleted = self._writer().delete(*keys)
+        self._invalidate(*keys)
+        return deleted
+
+    def _fetch(self, key: str) -> Optional[bytes]:
+        """
+        Read the raw value of a key, going through
+        the near cache when one is configured.
+
+        Args:
+            key (str): The key to read.
+
+        Returns:
+            Optional[bytes]: The raw value, or None if missing.
+        """
+        if self._near is None:
+            return self._redis.get(key)
+        data = self._near.get(key)
+        if data is None:
+            data = self._redis.get(key)
+            if data is not None:
+                self._near.put(key, data)
+        return data
+
+    def _writer(self) -> Union[redis.Redis, redis.client.Pipeline]:
+        """
+        Return the pipeline opened by the tracking decorators
+        for the current call, or the plain client otherwise.
+
+        Returns:
+            Union[redis.Redis, redis.client.Pipeline]:
+            The object that Redis writes should be issued on.
+        """
+        pipe = getattr(self._local, "pipeline", None)
+        return pipe if pipe is not None else self._redis
+
     def get(self, key: str, fn: Optional[
             Callable] = None) -> Optional[T]:
         """
@@ -167,8 +1393,9 @@ class Cache:
             Optional[T]: The retrieved data, possibly converted
             by fn, or None if the key does not exist.
         """
-        # Retrieve the data from Redis using the provided key
-        data = self._redis.get(key)
+        # Retrieve the data from the near cache or Redis
+        # using the provided key, decoded by the codec if any
+        data = self._decode(self._fetch(key))
 
         # If the key does not exist, Redis
         # returns None, so return None
@@ -188,6 +1415,33 @@ class Cache:
         # conversion function is provided
         return cast(T, data)
 
+    def get_many(self, keys: Iterable[str], fn: Optional[Callable] = None,
+                 chunk_size: int = CHUNK_SIZE) -> List[Optional[T]]:
+        """
+        Retrieve many values at once using MGET and
+        optionally apply a conversion function to each.
+
+        Args:
+            keys (Iterable[str]): The keys to retrieve.
+            fn (Optional[Callable]): A callable used to convert
+            each existing value to the desired original format.
+            chunk_size (int): The maximum number of keys
+            requested from Redis in one MGET.
+
+        Returns:
+            List[Optional[T]]: The values in the order of `keys`,
+            with None for every key that does not exist.
+        """
+        values = []
+        for chunk in chunks(keys, chunk_size):
+            found, missing = self._near_lookup(chunk)
+            # Only ask Redis for the keys the near cache missed
+            fetched = (self._redis.mget([chunk[i] for i in missing])
+                       if missing else [])
+            values.extend(self._merge_fetched(chunk, found, missing,
+                                              fetched, fn))
+        return values
+
     def get_str(self, key: str) -> Optional[str]:
         """
         Retrieve data from Redis
@@ -201,9 +1455,10 @@ class Cache:
             Optional[str]: The retrieved data as a
             string, or None if the key does not exist.
         """
-        # Use the get method with a `lambda` function
-        # to decode `bytes` to a `UTF-8` `string`
-        return self.get(key, fn=lambda d: d.decode('utf-8'))
+        # Use the get method with a function to decode
+        # `bytes` to a `UTF-8` `string` (or to convert a value
+        # already decoded by the codec)
+        return self.get(key, fn=to_str)
 
     def get_int(self, key: str) -> Optional[int]:
         """
@@ -223,36 +1478,632 @@ class Cache:
         return self.get(key, fn=int)
 
 
+class AsyncCache(CacheBase):
+    """
+    Asyncio counterpart of `Cache` built on `redis.asyncio`,
+    so many stores and reads can run concurrently on one
+    event loop without a thread per request.
+    """
+
+    def __init__(self, near_cache: Optional[NearCache] = None,
+                 history_policy: Optional[HistoryPolicy] = None,
+                 latency_recorder: Optional[LatencyRecorder] = None,
+                 counter_buffer: Optional[CounterBuffer] = None,
+                 client: Optional[redis.asyncio.Redis] = None,
+                 pool: Optional[redis.asyncio.ConnectionPool] = None,
+                 codec: Optional[Codec] = None):
+        """
+        Initialize the AsyncCache class by setting up
+        an asyncio Redis client. Use `AsyncCache.create`
+        to also flush the database like `Cache` does.
+
+        The client is the injected `client`, else one sharing
+        the given connection `pool`, else a new default one.
+
+        Args:
+            near_cache (Optional[NearCache]): An optional in-process
+            cache consulted by the `get` methods before Redis.
+            history_policy (Optional[HistoryPolicy]): Retention
+            settings for the history recorded by `call_history`.
+            latency_recorder (Optional[LatencyRecorder]): An optional
+            recorder of the latency of the `count_calls` methods,
+            which must be given its own synchronous client.
+            counter_buffer (Optional[CounterBuffer]): An optional
+            buffer delaying the counter writes of `count_calls`,
+            which must be given its own synchronous client.
+            client (Optional[redis.asyncio.Redis]): An existing
+            asyncio client to use.
+            pool (Optional[redis.asyncio.ConnectionPool]): A shared
+            connection pool (see `create_pool`) to build the client on.
+            codec (Optional[Codec]): An optional codec serializing
+            the stored values so `get` restores their type.
+        """
+        if client is not None:
+            self._redis = client
+        elif pool is not None:
+            self._redis = redis.asyncio.Redis(connection_pool=pool)
+        else:
+            self._redis = redis.asyncio.Redis()
+        # Only close the client in `close` if it was not injected
+        self._owns_client = client is None
+        # Per-task state holding the pipeline opened
+        # by the tracking decorators for the current call
+        self._local = TaskLocal()
+        self._near = near_cache
+        self._codec = codec
+        # Retention of the call history, overriding the decorators'
+        self.history_policy = history_policy
+        self.latency_recorder = latency_recorder
+        self.counter_buffer = counter_buffer
+
+    @classmethod
+    async def create(cls, near_cache: Optional[NearCache] = None,
+                     history_policy: Optional[HistoryPolicy] = None,
+                     latency_recorder: Optional[LatencyRecorder] = None,
+                     counter_buffer: Optional[CounterBuffer] = None,
+                     client: Optional[redis.asyncio.Redis] = None,
+                     pool: Optional[redis.asyncio.ConnectionPool] = None,
+                     flush: Optional[bool] = None,
+                     codec: Optional[Codec] = None) -> 'AsyncCache':
+        """
+        Create an AsyncCache and flush its Redis database,
+        by default only when it creates its own client.
+
+        Args:
+            near_cache (Optional[NearCache]): An optional in-process
+            cache consulted by the `get` methods before Redis.
+            history_policy (Optional[HistoryPolicy]): Retention
+            settings for the history recorded by `call_history`.
+            latency_recorder (Optional[LatencyRecorder]): An optional
+            recorder of the latency of the `count_calls` methods.
+            counter_buffer (Optional[CounterBuffer]): An optional
+            buffer delaying the counter writes of `count_calls`.
+            client (Optional[redis.asyncio.Redis]): An existing
+            asyncio client to use.
+            pool (Optional[redis.asyncio.ConnectionPool]): A shared
+            connection pool to build the client on.
+            flush (Optional[bool]): Whether to flush the database.
+            codec (Optional[Codec]): An optional codec serializing
+            the stored values so `get` restores their type.
+
+        Returns:
+            AsyncCache: The new cache.
+        """
+        cache = cls(near_cache, history_policy, latency_recorder,
+                    counter_buffer, client, pool, codec)
+        if flush is None:
+            flush = client is None and pool is None
+        if flush:
+            await cache._redis.flushdb()
+        return cache
+
+    async def close(self) -> None:
+        """
+        Close the connections of the underlying Redis client,
+        unless it was injected by the caller.
+        """
+        if self._owns_client:
+            await self._redis.aclose()
+
+    @count_calls
+    @call_history
+    async def store(self, data: Union[str, bytes, int, float]) -> str:
+        """
+        Store the provided input data in
+        Redis using a randomly generated key.
+
+        Args:
+            data (Union[str, bytes, int, float]):
+            The data to store in Redis.
+
+        Returns:
+            str: The randomly generated key
+            which is used to store the data.
+        """
+        key = str(uuid.uuid4())
+        # Queued on the decorators' pipeline, sent when they finish
+        self._local.pipeline.set(key, self._encode(data))
+        self._invalidate(key)
+        return key
+
+    async def store_many(self,
+                         values: Iterable[Union[str, bytes, int, float]],
+                         chunk_size: int = CHUNK_SIZE) -> List[str]:
+        """
+        Store many values at once using MSET; see `Cache.store_many`.
+
+        Args:
+            values (Iterable[Union[str, bytes, int, float]]):
+            The values to store in Redis.
+            chunk_size (int): The maximum number of values
+            sent to Redis in one MSET.
+
+        Returns:
+            List[str]: The generated keys, in the order of `values`.
+        """
+        name = AsyncCache.store.__qualname__
+        keys = []
+        for chunk in chunks(values, chunk_size):
+            chunk_keys = [str(uuid.uuid4()) for _ in chunk]
+            async with async_tracking_pipeline(self) as pipe:
+                count_call(self, pipe, name, len(chunk))
+                pipe.mset(dict(zip(chunk_keys, map(self._encode, chunk))))
+                policy = resolve_history_policy(
+                    self, AsyncCache.store.history_policy)
+                policy.record(pipe, name, [(value,) for value in chunk],
+                              chunk_keys)
+            self._invalidate(name, *chunk_keys)
+            keys.extend(chunk_keys)
+        return keys
+
+    async def delete(self, *keys: str) -> int:
+        """
+        Delete keys from Redis and from the near cache.
+
+        Args:
+            *keys (str): The keys to delete.
+
+        Returns:
+            int: The number of keys that existed in Redis.
+        """
+        deleted = await self._redis.delete(*keys)
+        self._invalidate(*keys)
+        return deleted
+
+    async def get(self, key: str, fn: Optional[
+            Callable] = None) -> Optional[T]:
+        """
+        Retrieve data from Redis and
+        optionally apply a conversion function.
+
+        Args:
+            key (str): The key used to retrieve the data from Redis.
+            fn (Optional[Callable]): A callable function used to
+            convert the data to the desired original format.
+
+        Returns:
+            Optional[T]: The retrieved data, possibly converted
+            by fn, or None if the key does not exist.
+        """
+        data = None if self._near is None else self._near.get(key)
+        if data is None:
+            data = await self._redis.get(key)
+            if data is not None and self._near is not None:
+                self._near.put(key, data)
+        data = self._decode(data)
+        if data is None:
+            return None
+        if fn is not None:
+            return fn(data)
+        return cast(T, data)
+
+    async def get_many(self, keys: Iterable[str],
+                       fn: Optional[Callable] = None,
+                       chunk_size: int = CHUNK_SIZE) -> List[Optional[T]]:
+        """
+        Retrieve many values at once using MGET; see `Cache.get_many`.
+
+        Args:
+            keys (Iterable[str]): The keys to retrieve.
+            fn (Optional[Callable]): A callable used to convert
+            each existing value to the desired original format.
+            chunk_size (int): The maximum number of keys
+            requested from Redis in one MGET.
+
+        Returns:
+            List[Optional[T]]: The values in the order of `keys`,
+            with None for every key that does not exist.
+        """
+        values = []
+        for chunk in chunks(keys, chunk_size):
+            found, missing = self._near_lookup(chunk)
+            fetched = (await self._redis.mget([chunk[i] for i in missing])
+                       if missing else [])
+            values.extend(self._merge_fetched(chunk, found, missing,
+                                              fetched, fn))
+        return values
+
+    async def get_str(self, key: str) -> Optional[str]:
+        """
+        Retrieve data from Redis
+        and convert it to a string.
+
+        Args:
+            key (str): The key used to
+            retrieve the data from Redis.
+
+        Returns:
+            Optional[str]: The retrieved data as a
+            string, or None if the key does not exist.
+        """
+        return await self.get(key, fn=to_str)
+
+    async def get_int(self, key: str) -> Optional[int]:
+        """
+        Retrieve data from Redis and
+        convert it to an integer.
+
+        Args:
+            key (str): The key used to
+            retrieve the data from Redis.
+
+        Returns:
+            Optional[int]: The retrieved data as an
+            integer, or None if the key does not exist.
+        """
+        return await self.get(key, fn=int)
+
+
+def decode_history_entry(data: bytes) -> str:
+    """
+    Decode a history entry written by `HistoryPolicy.encode`.
+
+    Args:
+        data (bytes): The entry read from Redis.
+
+    Returns:
+        str: The text of the entry.
+    """
+    # Plain entries carry no codec prefix and are returned as is
+    return to_str(Codec().decode(data))
+
+
+def replay_header(name: str, retained: int,
+                  calls: Optional[bytes]) -> str:
+    """
+    Build the first line printed by `replay`.
+
+    Args:
+        name (str): The qualified name of the method.
+        retained (int): The number of entries in the history.
+        calls (Optional[bytes]): The `<name>:calls` counter kept
+        by bounded histories, or None for a complete history.
+
+    Returns:
+        str: The header, mentioning dropped calls if any.
+    """
+    total = retained if calls is None else int(calls)
+    if total == retained:
+        return f"{name} was called {total} times:"
+    return (f"{name} was called {total} times "
+            f"({total - retained} dropped from history):")
+
+
+def history_pages(length: int, start: int, limit: Optional[int],
+                  reverse: bool, page_size: int
+                  ) -> Iterator[Tuple[int, int]]:
+    """
+    Compute the LRANGE bounds of the pages to read from a
+    history list of the given length.
+
+    Args:
+        length (int): The number of entries in the list.
+        start (int): The number of entries to skip, counted
+        from the oldest entry (or the newest if `reverse`).
+        limit (Optional[int]): The maximum number of entries
+        to read, or None to read up to the end.
+        reverse (bool): Whether to go from newest to oldest.
+        page_size (int): The number of entries per page.
+
+    Yields:
+        Tuple[int, int]: The inclusive start and end index
+        of each page, in reading order.
+    """
+    count = max(length - start, 0)
+    if limit is not None:
+        count = min(count, limit)
+    for offset in range(0, count, page_size):
+        size = min(page_size, count - offset)
+        if reverse:
+            end = length - 1 - start - offset
+            yield end - size + 1, end
+        else:
+            first = start + offset
+            yield first, first + size - 1
+
+
+def uses_stream(method: Callable) -> bool:
+    """
+    Tell whether a bound method records its history in a stream.
+
+    Args:
+        method (Callable): The bound method decorated with
+        `call_history`.
+
+    Returns:
+        bool: True if its history policy has `stream` set.
+    """
+    default = getattr(method, "history_policy", None) or HistoryPolicy()
+    return resolve_history_policy(method.__self__, default).stream
+
+
+def stream_page(redis_instance, key: str, after: Optional[bytes],
+                reverse: bool, count: int) -> list:
+    """
+    Read the next page of a stream, strictly after (or before,
+    going in reverse) the entry ID `after`.
+
+    Args:
+        redis_instance: The Redis client to read with.
+        key (str): The stream key.
+        after (Optional[bytes]): The last ID read, or None.
+        reverse (bool): Whether to go from newest to oldest.
+        count (int): The maximum number of entries to read.
+
+    Returns:
+        list: The (entry ID, fields) pairs of the page.
+    """
+    if reverse:
+        bound = "+" if after is None else b"(" + after
+        return redis_instance.xrevrange(key, bound, "-", count=count)
+    bound = "-" if after is None else b"(" + after
+    return redis_instance.xrange(key, bound, "+", count=count)
+
+
+class StreamHistoryPager:
+    """
+    Paging state of a stream history read with XRANGE, shared by
+    the synchronous and asynchronous history iterators: `read`
+    requests the next page and `consume` extracts its entries.
+    """
+
+    def __init__(self, name: str, start: int, limit: Optional[int],
+                 reverse: bool, page_size: int):
+        """
+        Start reading a stream history from its first page.
+
+        Args:
+            name (str): The qualified name of the method.
+            start (int): The number of entries to skip first.
+            limit (Optional[int]): The maximum number of entries.
+            reverse (bool): Whether to go from newest to oldest.
+            page_size (int): The number of entries per XRANGE.
+        """
+        self.key = f"{name}:history"
+        self.start = start
+        self.limit = limit
+        self.reverse = reverse
+        self.page_size = page_size
+        # Last entry ID read and number of entries seen so far
+        self.after: Optional[bytes] = None
+        self.seen = 0
+        self.exhausted = False
+
+    @property
+    def done(self) -> bool:
+        """Whether every requested entry has been read."""
+        return self.exhausted or (self.limit is not None and
+                                  self.seen >= self.start + self.limit)
+
+    def read(self, redis_instance):
+        """
+        Read the next page (awaitable with an asyncio client).
+
+        Args:
+            redis_instance: The Redis client to read with.
+
+        Returns:
+            The (entry ID, fields) pairs of the page.
+        """
+        return stream_page(redis_instance, self.key, self.after,
+                           self.reverse, self.page_size)
+
+    def consume(self, page: list) -> List[Tuple[str, str]]:
+        """
+        Extract the requested entries of a page and advance past it.
+
+        Args:
+            page (list): The page returned by `read`.
+
+        Returns:
+            List[Tuple[str, str]]: The decoded inputs and output
+            of each call of the page within the range.
+        """
+        entries = []
+        for entry_id, fields in page:
+            self.after = entry_id
+            self.seen += 1
+            if self.seen <= self.start:
+                continue
+            if self.limit is not None and self.seen > self.start + self.limit:
+                self.exhausted = True
+                break
+            entries.append((decode_history_entry(fields[b"input"]),
+                            decode_history_entry(fields[b"output"])))
+        if len(page) < self.page_size:
+            self.exhausted = True
+        return entries
+
+
+def history_page_entries(inputs: list, outputs: list,
+                         reverse: bool) -> List[Tuple[str, str]]:
+    """
+    Decode a page of the inputs and outputs lists of a history.
+
+    Args:
+        inputs (list): The page of the inputs list.
+        outputs (list): The same page of the outputs list.
+        reverse (bool): Whether to go from newest to oldest.
+
+    Returns:
+        List[Tuple[str, str]]: The decoded inputs and output
+        of each call of the page.
+    """
+    entries = [(decode_history_entry(input_data),
+                decode_history_entry(output_data))
+               for input_data, output_data in zip(inputs, outputs)]
+    return entries[::-1] if reverse else entries
+
+
+def iter_stream_history(redis_instance, name: str, start: int,
+                        limit: Optional[int], reverse: bool,
+                        page_size: int) -> Iterator[Tuple[str, str]]:
+    """
+    Iterate over a stream history page by page with XRANGE.
+
+    Args:
+        redis_instance: The Redis client to read with.
+        name (str): The qualified name of the method.
+        start (int): The number of entries to skip first.
+        limit (Optional[int]): The maximum number of entries.
+        reverse (bool): Whether to go from newest to oldest.
+        page_size (int): The number of entries per XRANGE.
+
+    Yields:
+        Tuple[str, str]: The decoded inputs and output of each call.
+    """
+    pager = StreamHistoryPager(name, start, limit, reverse, page_size)
+    while not pager.done:
+        yield from pager.consume(pager.read(redis_instance))
+
+
+def iter_history(method: Callable, start: int = 0,
+                 limit: Optional[int] = None, reverse: bool = False,
+                 page_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily iterate over the history of calls of a method,
+    reading the inputs and outputs lists one page at a time
+    so memory use does not grow with the history length.
+
+    Args:
+        method (Callable): The bound method whose history is read.
+        start (int): The number of entries to skip first.
+        limit (Optional[int]): The maximum number of entries.
+        reverse (bool): Whether to go from newest to oldest.
+        page_size (int): The number of entries per LRANGE.
+
+    Yields:
+        Tuple[str, str]: The decoded inputs and output of each call.
+    """
+    redis_instance = method.__self__._redis
+    if uses_stream(method):
+        yield from iter_stream_history(redis_instance, method.__qualname__,
+                                       start, limit, reverse, page_size)
+        return
+
+    key_inputs = f"{method.__qualname__}:inputs"
+    key_outputs = f"{method.__qualname__}:outputs"
+    length = redis_instance.llen(key_inputs)
+    for first, last in history_pages(length, start, limit,
+                                     reverse, page_size):
+        # Read both pages in a single round trip
+        pipe = redis_instance.pipeline(transaction=False)
+        pipe.lrange(key_inputs, first, last)
+        pipe.lrange(key_outputs, first, last)
+        inputs, outputs = pipe.execute()
+        yield from history_page_entries(inputs, outputs, reverse)
+
+
 # @staticmethod
-def replay(method: Callable):
+def replay(method: Callable, start: int = 0, limit: Optional[int] = None,
+           reverse: bool = False, file: Optional[IO[str]] = None,
+           page_size: int = CHUNK_SIZE) -> None:
     """
     Display the history of calls for/to
     a particular function/method.
 
+    The history is streamed page by page (see `iter_history`),
+    so replaying a long history uses constant memory.
+
     Args:
         method (Callable): The function/method
         whose call history is to be replayed.
+        start (int): The number of entries to skip first.
+        limit (Optional[int]): The maximum number of entries.
+        reverse (bool): Whether to go from newest to oldest.
+        file (Optional[IO[str]]): The stream to write to,
+        defaulting to the standard output.
+        page_size (int): The number of entries per LRANGE.
     """
-    # Construct the keys for inputs and outputs
-    # using the method's qualified name
-    key_inputs = f"{method.__qualname__}:inputs"
-    key_outputs = f"{method.__qualname__}:outputs"
-
-    # Retrieve all inputs and outputs from Redis
+    name = method.__qualname__
     # Access the Redis instance from the method
     redis_instance = method.__self__._redis
-    # Get all input entries
-    inputs = redis_instance.lrange(key_inputs, 0, -1)
-    # Get all output entries
-    outputs = redis_instance.lrange(key_outputs, 0, -1)
+    # Number of retained entries and total number of
+    # calls (the latter only kept by bounded histories)
+    if uses_stream(method):
+        retained = redis_instance.xlen(f"{name}:history")
+    else:
+        retained = redis_instance.llen(f"{name}:inputs")
+    calls = redis_instance.get(f"{name}:calls")
 
     # Print the number of times the method was called
-    print(f"{method.__qualname__} was called {len(inputs)} times:")
+    print(replay_header(name, retained, calls), file=file)
 
     # Loop over inputs and outputs and
     # print them in the specified format
-    for input_data, output_data in zip(inputs, outputs):
-        # Decode the byte strings and format the output
-        input_str = input_data.decode('utf-8')
-        output_str = output_data.decode('utf-8')
-        print(f"{method.__qualname__}(*{input_str}) -> {output_str}")
+    for input_str, output_str in iter_history(method, start, limit,
+                                              reverse, page_size):
+        print(f"{name}(*{input_str}) -> {output_str}", file=file)
+
+
+async def async_iter_history(method: Callable, start: int = 0,
+                             limit: Optional[int] = None,
+                             reverse: bool = False,
+                             page_size: int = CHUNK_SIZE
+                             ) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Asynchronous counterpart of `iter_history` for
+    the coroutine methods of an `AsyncCache`.
+
+    Args:
+        method (Callable): The bound method whose history is read.
+        start (int): The number of entries to skip first.
+        limit (Optional[int]): The maximum number of entries.
+        reverse (bool): Whether to go from newest to oldest.
+        page_size (int): The number of entries per LRANGE.
+
+    Yields:
+        Tuple[str, str]: The decoded inputs and output of each call.
+    """
+    redis_instance = method.__self__._redis
+    if uses_stream(method):
+        pager = StreamHistoryPager(method.__qualname__, start, limit,
+                                   reverse, page_size)
+        while not pager.done:
+            for entry in pager.consume(await pager.read(redis_instance)):
+                yield entry
+        return
+
+    key_inputs = f"{method.__qualname__}:inputs"
+    key_outputs = f"{method.__qualname__}:outputs"
+    length = await redis_instance.llen(key_inputs)
+    for first, last in history_pages(length, start, limit,
+                                     reverse, page_size):
+        pipe = redis_instance.pipeline(transaction=False)
+        pipe.lrange(key_inputs, first, last)
+        pipe.lrange(key_outputs, first, last)
+        inputs, outputs = await pipe.execute()
+        for entry in history_page_entries(inputs, outputs, reverse):
+            yield entry
+
+
+async def async_replay(method: Callable, start: int = 0,
+                       limit: Optional[int] = None, reverse: bool = False,
+                       file: Optional[IO[str]] = None,
+                       page_size: int = CHUNK_SIZE) -> None:
+    """
+    Display the history of calls for/to a
+    coroutine method of an `AsyncCache`.
+
+    Args:
+        method (Callable): The coroutine method
+        whose call history is to be replayed.
+        start (int): The number of entries to skip first.
+        limit (Optional[int]): The maximum number of entries.
+        reverse (bool): Whether to go from newest to oldest.
+        file (Optional[IO[str]]): The stream to write to,
+        defaulting to the standard output.
+        page_size (int): The number of entries per LRANGE.
+    """
+    name = method.__qualname__
+    redis_instance = method.__self__._redis
+    if uses_stream(method):
+        retained = await redis_instance.xlen(f"{name}:history")
+    else:
+        retained = await redis_instance.llen(f"{name}:inputs")
+    calls = await redis_instance.get(f"{name}:calls")
+
+    print(replay_header(name, retained, calls), file=file)
+    async for input_str, output_str in async_iter_history(
+            method, start, limit, reverse, page_size):
+        print(f"{name}(*{input_str}) -> {output_str}", file=file)
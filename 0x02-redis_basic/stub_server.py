@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stub server used by the web cache benchmarks.
+
+It serves a fixed page for every path after an optional delay
+and counts the requests it receives, so the benchmarks can
+measure how many fetches actually reach the upstream. With an
+ETag or Last-Modified value it answers matching conditional
+requests with a 304.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering every GET with `body`
+    after `delay` seconds, counting the requests in `hits`,
+    the 304 answers in `not_modified` and the body bytes
+    sent in `bytes_sent`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, body: str = "<html>stub</html>", delay: float = 0.0,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[str] = None):
+        """
+        Bind the server to a free port on localhost.
+
+        Args:
+            body (str): The page returned for every path.
+            delay (float): The number of seconds to wait
+            before answering each request.
+            etag (Optional[str]): The `ETag` header to send.
+            last_modified (Optional[str]): The `Last-Modified`
+            header to send.
+        """
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.body = body
+        self.delay = delay
+        self.etag = etag
+        self.last_modified = last_modified
+        self.hits = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.hits_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """
+        The base URL of the server.
+        """
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of `StubServer`.
+    """
+
+    def do_GET(self) -> None:
+        """
+        Count the request and answer it with the server's page.
+        """
+        server = self.server
+        time.sleep(server.delay)
+        unchanged = (
+            (server.etag is not None
+             and self.headers.get("If-None-Match") == server.etag)
+            or (server.last_modified is not None
+                and self.headers.get("If-Modified-Since")
+                == server.last_modified))
+        payload = b"" if unchanged else server.body.encode('utf-8')
+        with server.hits_lock:
+            server.hits += 1
+            server.not_modified += unchanged
+            server.bytes_sent += len(payload)
+
+        self.send_response(304 if unchanged else 200)
+        if server.etag is not None:
+            self.send_header("ETag", server.etag)
+        if server.last_modified is not None:
+            self.send_header("Last-Modified", server.last_modified)
+        if not unchanged:
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Silence the per-request log lines.
+        """
+
+
+def start_stub_server(body: str = "<html>stub</html>", delay: float = 0.0,
+                      etag: Optional[str] = None,
+                      last_modified: Optional[str] = None
+                      ) -> Tuple[StubServer, str]:
+    """
+    Start a stub server in a background thread.
+
+    Args:
+        body (str): The page returned for every path.
+        delay (float): The number of seconds to wait
+        before answering each request.
+        etag (Optional[str]): The `ETag` header to send.
+        last_modified (Optional[str]): The `Last-Modified`
+        header to send.
+
+    Returns:
+        Tuple[StubServer, str]: The server and its base URL.
+    """
+    server = StubServer(body, delay, etag, last_modified)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.url
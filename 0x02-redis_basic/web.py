@@ -6,13 +6,132 @@ The caching mechanism includes tracking the number of times a URL
 is accessed and setting an expiration time for the cached content.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+import math
+import random
 import redis
 import requests
-from typing import Callable
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import zlib
+
+# Number of seconds a cached page is fresh (soft TTL)
+CACHE_TTL = 10
+# Number of seconds a stale page can still be served while it
+# is refreshed in the background (the hard TTL is the sum)
+STALE_TTL = 50
+# Eagerness of the probabilistic early refresh (0 disables it)
+EARLY_REFRESH_BETA = 1.0
+# Number of seconds the cross-process fetch lock is held at most
+LOCK_TIMEOUT = 10
+# Number of seconds an upstream request may wait to connect or
+# between two reads, kept below LOCK_TIMEOUT so a slow fetch does
+# not outlive its lock
+FETCH_TIMEOUT = 8
+# Number of seconds between two checks of a fetch running elsewhere
+LOCK_POLL_INTERVAL = 0.05
+# Number of threads running the background refreshes
+REFRESH_WORKERS = 4
+# Size (bytes) from which page bodies are stored zlib-compressed
+COMPRESS_THRESHOLD = 1024
+# Largest stored body (bytes, after compression) admitted in the
+# cache: bigger pages are served but not cached, so a few giant
+# responses cannot evict many small hot ones
+MAX_PAGE_SIZE = 1024 * 1024
+# Whether `get_page` and `get_pages` track per-URL analytics
+ANALYTICS = False
+# Number of URLs kept in the analytics: the set is trimmed back
+# to this size (dropping the least hit URLs) once it doubles
+TOP_URLS_SIZE = 1000
+# Sorted set of hit counts by URL
+HITS_KEY = "analytics:hits"
+# HyperLogLog of the clients seen, suffixed with ":{url}" per URL
+CLIENTS_KEY = "analytics:clients"
+# Trims the hit counts to the ARGV[1] most hit URLs, atomically and
+# idempotently, and returns the URLs dropped
+TRIM_HITS_SCRIPT = """
+local dropped = redis.call('ZRANGE', KEYS[1], 0, -ARGV[1] - 1)
+if #dropped > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -ARGV[1] - 1)
+end
+return dropped
+"""
+
+# Single-flight metrics of this process: upstream fetches, and
+# callers served by a fetch of this process or of another one
+stats = {"fetches": 0, "coalesced": 0, "coalesced_remote": 0,
+         "stale": 0, "refreshes": 0, "revalidated": 0, "rejected": 0}
+_stats_lock = threading.Lock()
+
+# Maximum number of kept-alive connections per upstream host
+HTTP_POOL_SIZE = 32
+
+# Redis client connection, created on first use
+# (or injected with `configure_redis`)
+_redis: Optional[redis.Redis] = None
+# Shared keep-alive HTTP session, created on first use
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def configure_redis(client: Optional[redis.Redis] = None,
+                    pool: Optional[redis.ConnectionPool] = None
+                    ) -> redis.Redis:
+    """
+    Set the Redis client used by this module, either an
+    existing client or a new one sharing a connection pool.
+
+    Args:
+        client (Optional[redis.Redis]): The client to use.
+        pool (Optional[redis.ConnectionPool]): A shared pool to
+        build the client on when no client is given.
+
+    Returns:
+        redis.Redis: The client now used by this module.
+    """
+    global _redis
+    if client is None:
+        client = redis.Redis(connection_pool=pool) if pool is not None \
+            else redis.Redis()
+    _redis = client
+    return client
 
-# Initialize Redis client connection
-r = redis.Redis()
+
+def get_redis() -> redis.Redis:
+    """
+    Return the Redis client used by this module,
+    creating a default one on first use.
+
+    Returns:
+        redis.Redis: The module's Redis client.
+    """
+    if _redis is None:
+        return configure_redis()
+    return _redis
+
+
+def get_session() -> requests.Session:
+    """
+    Return the HTTP session shared by every fetch, so that
+    connections to an upstream are kept alive and reused
+    instead of paying a new TCP/TLS handshake per fetch.
+
+    Returns:
+        requests.Session: The module's HTTP session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
 
 
 def count_calls(method: Callable) -> Callable:
@@ -31,7 +150,7 @@ def count_calls(method: Callable) -> Callable:
     def wrapper(*args, **kwargs):
         # Increment the count in Redis
         # using the method's qualified name
-        r.incr(f"count:{method.__qualname__}")
+        get_redis().incr(f"count:{method.__qualname__}")
         # Execute the original method
         # and return its output
         return method(*args, **kwargs)
@@ -39,33 +158,662 @@ def count_calls(method: Callable) -> Callable:
     return wrapper
 
 
+def _track(urls: List[str], client: Optional[str] = None) -> None:
+    """
+    Record hits on some URLs in the analytics: their hit counts
+    in the `HITS_KEY` sorted set and, when the client is known,
+    the client in the HyperLogLogs of all hits and of each URL.
+
+    Memory stays bounded however many distinct URLs are hit:
+    past `2 * TOP_URLS_SIZE` URLs, the least hit ones and their
+    HyperLogLogs are dropped, so counts of rarely hit URLs are
+    approximate (they restart from zero once dropped).
+
+    Args:
+        urls (List[str]): The URLs hit, with repetitions.
+        client (Optional[str]): An identifier of the client.
+    """
+    r = get_redis()
+    pipe = r.pipeline(transaction=False)
+    for url in urls:
+        pipe.zincrby(HITS_KEY, 1, url)
+        if client is not None:
+            pipe.pfadd(f"{CLIENTS_KEY}:{url}", client)
+    if client is not None:
+        pipe.pfadd(CLIENTS_KEY, client)
+    pipe.zcard(HITS_KEY)
+    size = pipe.execute()[-1]
+
+    if size > 2 * TOP_URLS_SIZE:
+        # Concurrent trims drop nothing more than the first one
+        trim = r.register_script(TRIM_HITS_SCRIPT)
+        dropped = trim(keys=[HITS_KEY], args=[TOP_URLS_SIZE])
+        if dropped:
+            r.delete(*(f"{CLIENTS_KEY}:{url.decode('utf-8')}"
+                       for url in dropped))
+
+
+def top_urls(k: int = 10) -> List[Tuple[str, int]]:
+    """
+    Return the most hit URLs tracked by the analytics.
+
+    Args:
+        k (int): The number of URLs to return.
+
+    Returns:
+        List[Tuple[str, int]]: The URLs and their hit
+        counts, most hit first.
+    """
+    return [(url.decode('utf-8'), int(hits)) for url, hits in
+            get_redis().zrevrange(HITS_KEY, 0, k - 1, withscores=True)]
+
+
+def unique_clients(url: Optional[str] = None) -> int:
+    """
+    Return the estimated number of distinct clients seen by the
+    analytics, overall or for a URL (0 once it has been dropped).
+
+    Args:
+        url (Optional[str]): The URL, or None for all hits.
+
+    Returns:
+        int: The estimated number of distinct clients
+        (HyperLogLog, about 0.81% standard error).
+    """
+    key = CLIENTS_KEY if url is None else f"{CLIENTS_KEY}:{url}"
+    return get_redis().pfcount(key)
+
+
+def _count(metric: str) -> None:
+    """
+    Increment one of the single-flight metrics in `stats`.
+
+    Args:
+        metric (str): The name of the metric.
+    """
+    with _stats_lock:
+        stats[metric] += 1
+
+
+class _Flight:
+    """
+    A fetch in progress in this process, which other
+    callers asking for the same URL wait on.
+    """
+
+    def __init__(self):
+        """
+        Initialize a flight with no result yet.
+        """
+        self.done = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+# Fetches in progress in this process, by URL
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+# URLs queued for a background refresh, and the threads running
+# them (created on first use), also guarded by `_flights_lock`
+_refreshing: Set[str] = set()
+_refresher: Optional[ThreadPoolExecutor] = None
+
+
+def _read_entry(r: redis.Redis, url: str) -> Optional[Dict[bytes, bytes]]:
+    """
+    Read the cache entry of a URL.
+
+    A cache entry is a hash holding the page `body`, the time it
+    was `fetched` at and the `delta` (seconds) the fetch took;
+    `encoding` is set to "zlib" when the body is compressed.
+    Pages too large to cache leave an entry without a body but
+    with `rejected` set instead (see `_is_rejected`).
+
+    Args:
+        r (redis.Redis): The Redis client.
+        url (str): The URL of the page.
+
+    Returns:
+        Optional[Dict[bytes, bytes]]: The entry's fields, or None.
+    """
+    return r.hgetall(f"cache:{url}") or None
+
+
+def _is_rejected(entry: Dict[bytes, bytes]) -> bool:
+    """
+    Tell whether a cache entry marks a page too large to cache,
+    which callers fetch directly instead of waiting for it.
+
+    Args:
+        entry (Dict[bytes, bytes]): The cache entry of the page.
+
+    Returns:
+        bool: True if the page is not cached.
+    """
+    return b"rejected" in entry
+
+
+def _fetch_uncached(url: str) -> str:
+    """
+    Fetch a page that is not cached, without taking its lock
+    (callers of this process still share it, see `_join_flight`).
+
+    Args:
+        url (str): The URL to fetch.
+
+    Returns:
+        str: The HTML content of the page.
+    """
+    response, _ = _fetch(url)
+    return response.text
+
+
+def _encode_body(html_content: str) -> tuple:
+    """
+    Encode a page body for storage, compressing it
+    when it reaches `COMPRESS_THRESHOLD` bytes.
+
+    Args:
+        html_content (str): The page content.
+
+    Returns:
+        tuple: The stored bytes and their encoding (or None).
+    """
+    body = html_content.encode('utf-8')
+    if len(body) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(body)
+        # Keep the plain body when compression does not help
+        if len(compressed) < len(body):
+            return compressed, "zlib"
+    return body, None
+
+
+def _page_body(entry: Dict[bytes, bytes]) -> str:
+    """
+    Decode the page body of a cache entry.
+
+    Args:
+        entry (Dict[bytes, bytes]): The cache entry of the page.
+
+    Returns:
+        str: The HTML content of the page.
+    """
+    body = entry[b"body"]
+    if entry.get(b"encoding") == b"zlib":
+        body = zlib.decompress(body)
+    return body.decode('utf-8')
+
+
+def _queue_entry(pipe: redis.client.Pipeline, url: str,
+                 html_content: str, delta: float,
+                 etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> None:
+    """
+    Queue the writes caching a page until its hard TTL,
+    along with the validators the upstream sent for it.
+
+    Pages whose stored body exceeds `MAX_PAGE_SIZE` are not
+    admitted: any previous entry is replaced with a marker
+    telling callers to fetch the page directly for `CACHE_TTL`
+    seconds, rather than wait on each other's fetch lock.
+
+    Args:
+        pipe (redis.client.Pipeline): The pipeline to queue on.
+        url (str): The URL of the page.
+        html_content (str): The page content.
+        delta (float): The number of seconds the fetch took.
+        etag (Optional[str]): The `ETag` response header.
+        last_modified (Optional[str]): The `Last-Modified` header.
+    """
+    key = f"cache:{url}"
+    body, encoding = _encode_body(html_content)
+    pipe.delete(key)
+    if len(body) > MAX_PAGE_SIZE:
+        _count("rejected")
+        pipe.hset(key, mapping={"rejected": 1, "fetched": time.time(),
+                                "delta": delta})
+        pipe.expire(key, CACHE_TTL)
+        return
+    entry = {"body": body, "fetched": time.time(), "delta": delta}
+    if encoding is not None:
+        entry["encoding"] = encoding
+    if etag is not None:
+        entry["etag"] = etag
+    if last_modified is not None:
+        entry["last_modified"] = last_modified
+    pipe.hset(key, mapping=entry)
+    pipe.expire(key, CACHE_TTL + STALE_TTL)
+
+
+def _fetch(url: str, entry: Optional[Dict[bytes, bytes]] = None) -> tuple:
+    """
+    Fetch a page with the shared session, timing the request.
+
+    When a cache entry with validators is given, the request is
+    conditional (`If-None-Match` / `If-Modified-Since`) so an
+    unchanged page is answered with a body-less 304.
+
+    Args:
+        url (str): The URL to fetch.
+        entry (Optional[Dict[bytes, bytes]]): The current
+        cache entry of the page, if any.
+
+    Returns:
+        tuple: The response and the fetch duration in seconds.
+    """
+    headers = {}
+    if entry is not None:
+        if b"etag" in entry:
+            headers["If-None-Match"] = entry[b"etag"].decode('utf-8')
+        if b"last_modified" in entry:
+            headers["If-Modified-Since"] = \
+                entry[b"last_modified"].decode('utf-8')
+    _count("fetches")
+    started = time.monotonic()
+    response = get_session().get(url, headers=headers,
+                                 timeout=FETCH_TIMEOUT)
+    return response, time.monotonic() - started
+
+
+def _queue_response(pipe: redis.client.Pipeline, url: str,
+                    response: requests.Response, delta: float,
+                    entry: Optional[Dict[bytes, bytes]] = None) -> str:
+    """
+    Queue the cache update for a fetched page: on a 304 the entry
+    the request was conditional on is written back with a renewed
+    freshness (it may have expired meanwhile), otherwise the entry
+    is rewritten from the response.
+
+    Args:
+        pipe (redis.client.Pipeline): The pipeline to queue on.
+        url (str): The URL of the page.
+        response (requests.Response): The upstream response.
+        delta (float): The number of seconds the fetch took.
+        entry (Optional[Dict[bytes, bytes]]): The cache entry
+        the request was conditional on, if any.
+
+    Returns:
+        str: The HTML content of the page.
+    """
+    if response.status_code == 304 and entry is not None:
+        _count("revalidated")
+        key = f"cache:{url}"
+        fields = dict(entry)
+        fields[b"fetched"] = time.time()
+        fields[b"delta"] = delta
+        # A 304 may carry updated validators
+        for header, field in (("ETag", b"etag"),
+                              ("Last-Modified", b"last_modified")):
+            if header in response.headers:
+                fields[field] = response.headers[header]
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, CACHE_TTL + STALE_TTL)
+        return _page_body(entry)
+    _queue_entry(pipe, url, response.text, delta,
+                 response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"))
+    return response.text
+
+
+def _needs_refresh(entry: Dict[bytes, bytes]) -> bool:
+    """
+    Tell whether a cached page should be refreshed: once it is
+    stale, or a bit earlier at random so that the refreshes of
+    many pages (and processes) do not all happen at expiry.
+
+    The early refresh follows the "XFetch" rule: refresh when
+    `now - delta * beta * log(random())` reaches the expiry, so
+    slower pages get refreshed earlier.
+
+    Args:
+        entry (Dict[bytes, bytes]): The cache entry of the page.
+
+    Returns:
+        bool: True if a refresh should be started.
+    """
+    expiry = float(entry[b"fetched"]) + CACHE_TTL
+    delta = float(entry[b"delta"])
+    # 1 - random() lies in (0, 1], so its log is defined
+    jitter = -delta * EARLY_REFRESH_BETA * math.log(1 - random.random())
+    return time.time() + jitter >= expiry
+
+
+def _fetch_and_cache(url: str, wait: bool = True) -> Optional[str]:
+    """
+    Fetch a page and cache it, letting a single process at a
+    time do so thanks to a short Redis lock. Processes that do
+    not get the lock wait for the page to appear in the cache,
+    or give up right away if `wait` is False.
+
+    Args:
+        url (str): The URL to fetch.
+        wait (bool): Whether to wait for a fetch running
+        in another process.
+
+    Returns:
+        Optional[str]: The HTML content of the page, or None
+        if another process is fetching it and `wait` is False.
+    """
+    r = get_redis()
+    lock = r.lock(f"lock:{url}", timeout=LOCK_TIMEOUT)
+    while not lock.acquire(blocking=False):
+        if not wait:
+            return None
+        # Another process is fetching: wait for its result
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = _read_entry(r, url)
+        if entry is not None:
+            if _is_rejected(entry):
+                # Too large to be cached: no point in waiting
+                return _fetch_uncached(url)
+            _count("coalesced_remote")
+            return _page_body(entry)
+    try:
+        entry = _read_entry(r, url)
+        if entry is not None and _is_rejected(entry):
+            # Fetch the page again, renewing the marker
+            entry = None
+        # The page may have been cached while we were waiting
+        if wait and entry is not None:
+            return _page_body(entry)
+
+        # If not cached (or being refreshed), fetch the content
+        # using requests, conditionally on the cached copy if any
+        response, delta = _fetch(url, entry)
+
+        # Cache the content in Redis until its hard TTL
+        pipe = r.pipeline(transaction=True)
+        html_content = _queue_response(pipe, url, response, delta, entry)
+        pipe.execute()
+        return html_content
+    finally:
+        _release(lock)
+
+
+def _release(lock: redis.lock.Lock) -> None:
+    """
+    Release a fetch lock, unless it already expired.
+
+    Args:
+        lock (redis.lock.Lock): The lock to release.
+    """
+    try:
+        lock.release()
+    except redis.exceptions.LockError:
+        # The lock expired during a slow fetch
+        pass
+
+
+def _land(url: str, flight: _Flight) -> None:
+    """
+    End the flight of a URL, waking up the callers waiting on it.
+
+    Args:
+        url (str): The URL fetched.
+        flight (_Flight): Its flight, with its result or error set.
+    """
+    with _flights_lock:
+        del _flights[url]
+    flight.done.set()
+
+
+def _join_flight(url: str, wait: bool = True,
+                 cache: bool = True) -> Optional[str]:
+    """
+    Fetch a page, sharing the fetch with every other caller of
+    this process asking for the same URL at the same time.
+
+    Args:
+        url (str): The URL to fetch.
+        wait (bool): Whether to wait for a fetch already running
+        (in this process or another one); if False, return None
+        instead of waiting.
+        cache (bool): Whether to cache the page; pages marked as
+        too large are fetched without the cross-process lock, and
+        only shared with the callers of this process.
+
+    Returns:
+        Optional[str]: The HTML content of the page, or None
+        if `wait` is False and the page is already being fetched.
+    """
+    # Join the fetch of this URL already in progress, if any
+    with _flights_lock:
+        flight = _flights.get(url)
+        leader = flight is None
+        if leader:
+            flight = _flights[url] = _Flight()
+    if not leader:
+        if not wait:
+            return None
+        _count("coalesced")
+        landed = flight.done.wait(LOCK_TIMEOUT)
+        if flight.error is not None:
+            raise flight.error
+        if not landed or flight.result is None:
+            # The leader is stuck, or was a background refresh that
+            # gave up to a fetch running in another process: wait
+            # for the page like another process would
+            return _fetch_and_cache(url)
+        return flight.result
+
+    try:
+        flight.result = (_fetch_and_cache(url, wait) if cache
+                         else _fetch_uncached(url))
+        return flight.result
+    except BaseException as error:
+        flight.error = error
+        raise
+    finally:
+        _land(url, flight)
+
+
+def _refresh(url: str) -> None:
+    """
+    Refresh a cached page in the background, unless it is
+    already being fetched or queued for a refresh.
+
+    Refreshes run on a pool of `REFRESH_WORKERS` threads, so a
+    burst of stale hits costs no thread per hit.
+
+    Args:
+        url (str): The URL to refresh.
+    """
+    global _refresher
+
+    def run() -> None:
+        """Fetch the page, ignoring errors (the stale copy stays)."""
+        try:
+            if _join_flight(url, wait=False) is not None:
+                _count("refreshes")
+        except Exception:
+            pass
+        finally:
+            with _flights_lock:
+                _refreshing.discard(url)
+
+    with _flights_lock:
+        if url in _flights or url in _refreshing:
+            return
+        _refreshing.add(url)
+        if _refresher is None:
+            _refresher = ThreadPoolExecutor(
+                max_workers=REFRESH_WORKERS,
+                thread_name_prefix="refresh")
+        _refresher.submit(run)
+
+
 @count_calls
-async def get_page(url: str) -> str:
+def get_page(url: str, client: Optional[str] = None) -> str:
     """
     Fetches the HTML content from a given URL
     and caches it in Redis with an expiration time.
 
+    A cached page is fresh for `CACHE_TTL` seconds and can then
+    be served stale for `STALE_TTL` more seconds while it is
+    refreshed in the background; pages are also refreshed a bit
+    before going stale, at random, to spread the refreshes.
+
+    On a cache miss, concurrent callers for the same URL share
+    a single upstream request: within this process they wait on
+    the caller already fetching it, and across processes a short
+    Redis lock lets only one of them fetch (see `stats`).
+
+    Refreshes of a cached page are conditional GETs using its
+    `ETag` / `Last-Modified` validators: when the upstream
+    answers 304, only the entry's freshness and TTL are renewed.
+
+    Bodies of `COMPRESS_THRESHOLD` bytes or more are stored
+    compressed, and pages still larger than `MAX_PAGE_SIZE` once
+    compressed are fetched on every call instead of cached, in
+    parallel rather than one caller at a time.
+
+    When `ANALYTICS` is set, the hit is recorded per URL (see
+    `top_urls` and `unique_clients`).
+
     Args:
         url (str): The URL to fetch.
+        client (Optional[str]): An identifier of the client
+        (e.g. its address), counted by the analytics.
 
     Returns:
         str: The HTML content of the page.
     """
+    if ANALYTICS:
+        _track([url], client)
     # Check if the content is already cached in Redis
-    cached_content = r.get(f"cache:{url}")
-    if cached_content:
+    entry = _read_entry(get_redis(), url)
+    if entry is not None and _is_rejected(entry):
+        return _join_flight(url, cache=False)
+    if entry is not None:
+        if _needs_refresh(entry):
+            if time.time() >= float(entry[b"fetched"]) + CACHE_TTL:
+                _count("stale")
+            _refresh(url)
         # If cached, decode and return the content
-        return (await cached_content).decode('utf-8')
+        return _page_body(entry)
+
+    return _join_flight(url)
+
+
+def _fetch_pages(r: redis.Redis, urls: List[str], pages: Dict[str, str],
+                 concurrency: int) -> None:
+    """
+    Fetch the missing pages no other caller is fetching, leading
+    their flights and holding their fetch locks until the pages
+    are all written back in a single pipeline.
 
-    # If not cached, fetch the content using requests
-    response = requests.get(url)
-    html_content = response.text
+    Args:
+        r (redis.Redis): The Redis client.
+        urls (List[str]): The URLs of the missing pages.
+        pages (Dict[str, str]): The pages by URL, completed with
+        the pages fetched (or cached meanwhile).
+        concurrency (int): The maximum number of
+        simultaneous upstream requests.
+    """
+    flights = {}
+    with _flights_lock:
+        for url in urls:
+            if url not in _flights:
+                flights[url] = _flights[url] = _Flight()
+    locks = {}
+    try:
+        for url in flights:
+            lock = r.lock(f"lock:{url}", timeout=LOCK_TIMEOUT)
+            if lock.acquire(blocking=False):
+                locks[url] = lock
+        # Some pages may have been cached since they were read
+        pipe = r.pipeline(transaction=False)
+        for url in locks:
+            pipe.hgetall(f"cache:{url}")
+        fetching = []
+        for url, entry in zip(locks, pipe.execute()):
+            if entry and not _is_rejected(entry):
+                pages[url] = _page_body(entry)
+            else:
+                fetching.append(url)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            fetched = list(executor.map(_fetch, fetching))
+        # MULTI/EXEC, so that no reader sees a key between the
+        # DELETE and the HSET of its entry
+        pipe = r.pipeline(transaction=True)
+        for url, (response, delta) in zip(fetching, fetched):
+            pages[url] = _queue_response(pipe, url, response, delta)
+        pipe.execute()
+    finally:
+        for lock in locks.values():
+            _release(lock)
+        # Callers waiting on a page left without a result (locked
+        # by another process, or failed) fetch it themselves
+        for url, flight in flights.items():
+            flight.result = pages.get(url)
+            _land(url, flight)
+
+
+@count_calls
+def get_pages(urls: Iterable[str], concurrency: int = 8,
+              client: Optional[str] = None) -> List[str]:
+    """
+    Fetch the HTML content of many URLs at once.
 
-    # Cache the content in Redis
-    # with a 10-second expiration time
-    r.setex(f"cache:{url}", 10, html_content)
+    The cache entries of all the URLs are read in one round trip,
+    only the missing pages are fetched, `concurrency` at a time
+    over the shared keep-alive session, and they are all written
+    back in a single pipeline. Stale pages are served and
+    refreshed in the background, like in `get_page`.
 
-    return html_content
+    Missing pages share their fetch with the other callers like
+    in `get_page`: this call only fetches the pages no other
+    caller (of this process or another one) is fetching, then
+    waits for the others once its own are cached.
+
+    Args:
+        urls (Iterable[str]): The URLs to fetch.
+        concurrency (int): The maximum number of
+        simultaneous upstream requests.
+        client (Optional[str]): An identifier of the client,
+        counted by the analytics.
+
+    Returns:
+        List[str]: The HTML content of each page, in order.
+    """
+    urls = list(urls)
+    if ANALYTICS:
+        _track(urls, client)
+    unique = list(dict.fromkeys(urls))
+    r = get_redis()
+
+    pipe = r.pipeline(transaction=False)
+    for url in unique:
+        pipe.hgetall(f"cache:{url}")
+    pages = {}
+    missing = []
+    uncached = []
+    for url, entry in zip(unique, pipe.execute()):
+        if not entry:
+            missing.append(url)
+            continue
+        if _is_rejected(entry):
+            uncached.append(url)
+            continue
+        if _needs_refresh(entry):
+            if time.time() >= float(entry[b"fetched"]) + CACHE_TTL:
+                _count("stale")
+            _refresh(url)
+        pages[url] = _page_body(entry)
+
+    if missing:
+        _fetch_pages(r, missing, pages, concurrency)
+    # Wait for the pages fetched by other callers, only now that
+    # this call holds no flight or lock anybody could wait on
+    rest = [url for url in missing if url not in pages]
+    if rest or uncached:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pages.update(zip(rest, executor.map(_join_flight, rest)))
+            pages.update(zip(uncached, executor.map(
+                lambda url: _join_flight(url, cache=False), uncached)))
+
+    return [pages[url] for url in urls]
 
 
 if __name__ == "__main__":